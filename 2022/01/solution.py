@@ -1,8 +1,19 @@
+import random
+
 from utils.solution import BaseSolution
 
 
 class Solution(BaseSolution):
 
+    copy_strategy = "none"
+
+    def generate_input(self, scale: int, seed: int = 0) -> str:
+        rng = random.Random(seed)
+        elves = []
+        for _ in range(250 * scale):
+            elves.append("\n".join(str(rng.randint(1000, 70000)) for _ in range(rng.randint(1, 15))))
+        return "\n\n".join(elves) + "\n"
+
     def parse(self, raw: str) -> list[list[int]]:
         elves = []
         for elf in raw.rstrip("\n").split("\n\n"):
@@ -3,11 +3,14 @@ from utils.solution import BaseSolution
 
 class Solution(BaseSolution):
 
-    def parse(self, raw: str) -> list[list[str]]:
-        raw = raw.rstrip("\n")
+    copy_strategy = "none"
+    input_mode = "lines"
+
+    def parse_stream(self, lines) -> list[list[str]]:
         strategy = []
-        for line in raw.split("\n"):
-            strategy.append(line.split())
+        for line in lines:
+            if line:
+                strategy.append(line.split())
         return strategy
 
     def part1(self, data) -> int:
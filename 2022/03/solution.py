@@ -3,6 +3,8 @@ from utils.solution import BaseSolution
 
 class Solution(BaseSolution):
 
+    copy_strategy = "none"
+
     def _char_to_num(self, char: str) -> int:
         if char.islower():
             return ord(char) - 96
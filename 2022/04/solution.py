@@ -6,6 +6,8 @@ from utils.solution import BaseSolution
 
 class Solution(BaseSolution):
 
+    copy_strategy = "none"
+
     def parse(self, raw: str):
         raw = raw.rstrip("\n")
         cleaning = []
@@ -18,7 +20,7 @@ class Solution(BaseSolution):
 
     def part1(self, data) -> int:
         """How many elves' cleaning duties completely contain each other?"""
-        print(data)
+        self.trace("%s", data)
         total = 0
         for pair in data:
             if pair[0] in pair[1] or pair[1] in pair[0]:
@@ -1,4 +1,3 @@
-import copy
 import re
 
 from utils.solution import BaseSolution
@@ -6,6 +5,9 @@ from utils.solution import BaseSolution
 
 class Solution(BaseSolution):
 
+    # Both parts move things around in place.
+    copy_strategy = "reparse"
+
     def _get_result(self, crates: list[list]) -> str:
         result = ""
         for stack in crates:
@@ -41,7 +43,6 @@ class Solution(BaseSolution):
     def part1(self, data) -> str:
         """What do the final stacks look like if moving crates one at a time?"""
         crates, moves = data
-        crates = copy.deepcopy(crates)
         for move in moves:
             # Move the crates one by one.
             for _ in range(move[0]):
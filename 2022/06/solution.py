@@ -1,11 +1,25 @@
+import random
+
 from utils.solution import BaseSolution
 
 
 class Solution(BaseSolution):
 
-    def parse(self, raw: str):
-        raw = raw.rstrip("\n")
-        return raw
+    copy_strategy = "none"
+    input_mode = "bytes"
+
+    def generate_input(self, scale: int, seed: int = 0) -> str:
+        # Three letters never make a marker, so both parts have to scan all the way to the end.
+        rng = random.Random(seed)
+        padding = "".join(rng.choice("abc") for _ in range(4096 * scale))
+        return padding + "abcdefghijklmnopqrstuvwxyz" + "\n"
+
+    def parse_bytes(self, buffer: memoryview):
+        # Scan the characters as bytes straight from the file rather than decoding it first.
+        end = len(buffer)
+        while end > 0 and buffer[end-1] in b"\r\n":
+            end -= 1
+        return buffer[:end]
 
     def part1(self, data) -> int:
         """At which index do we have four different letters for the first time?"""
@@ -1,3 +1,4 @@
+import random
 from collections import namedtuple
 
 from utils.solution import BaseSolution
@@ -5,6 +6,32 @@ from utils.solution import BaseSolution
 
 class Solution(BaseSolution):
 
+    copy_strategy = "none"
+
+    def generate_input(self, scale: int, seed: int = 0) -> str:
+        rng = random.Random(seed)
+        # Attach every new directory to a random earlier one, which makes for a tree of logarithmic depth.
+        children = {0: []}
+        for idx in range(1, 180 * scale):
+            children[rng.randrange(idx)].append(idx)
+            children[idx] = []
+
+        lines = []
+        pending = [(0, False)]
+        while pending:
+            idx, leaving = pending.pop()
+            if leaving:
+                lines.append("$ cd ..")
+                continue
+            lines.append("$ cd /" if idx == 0 else f"$ cd d{idx}")
+            lines.append("$ ls")
+            lines.extend(f"dir d{child}" for child in children[idx])
+            lines.extend(f"{rng.randint(1000, 300000)} f{n}.txt" for n in range(rng.randint(0, 4)))
+            if idx != 0:
+                pending.append((idx, True))
+            pending.extend((child, False) for child in reversed(children[idx]))
+        return "\n".join(lines) + "\n"
+
     def parse(self, raw: str):
         raw = raw.rstrip("\n")
         root = Directory("/")
@@ -48,9 +75,13 @@ class Solution(BaseSolution):
         return min(map(lambda d: d.size, filter(lambda d: d.size >= space_needed, data.get_all_dirs())))
 
 
+# Defined at module level so that directory trees can be pickled.
+File = namedtuple("File", ["name", "size"])
+
+
 class Directory:
 
-    File = namedtuple("File", ["name", "size"])
+    File = File
 
     def __init__(self, name: str, parent=None):
         self.name = name
@@ -1,11 +1,22 @@
+import math
+import random
+
 from utils.puzzles.geometry import Point
 from utils.solution import BaseSolution
 
 
 class Solution(BaseSolution):
 
+    copy_strategy = "none"
+    input_mode = "bytes"
+
     directions_nswe = (0, -1), (0, 1), (-1, 0), (1, 0)
 
+    def generate_input(self, scale: int, seed: int = 0) -> str:
+        rng = random.Random(seed)
+        side = round(99 * math.sqrt(scale))
+        return "".join("".join(rng.choices("0123456789", k=side)) + "\n" for _ in range(side))
+
     def _get_to_edge(self, data, pos: Point, delta):
         """Get all elements from the given position to one of the edges of the forest."""
         pos = pos + delta
@@ -13,9 +24,14 @@ class Solution(BaseSolution):
             yield data[pos.y][pos.x]
             pos = pos + delta
 
-    def parse(self, raw: str):
-        raw = raw.rstrip("\n")
-        return [[int(tree) for tree in line] for line in raw.split("\n")]
+    def parse_bytes(self, buffer: memoryview):
+        # Only ever compare trees with each other, so the ASCII values of the digits work just as well as the digits.
+        # Every row then is a zero-copy view into the input file.
+        width = 0
+        while width < len(buffer) and buffer[width] != ord("\n"):
+            width += 1
+        stride = width + 1
+        return [buffer[start:start + width] for start in range(0, len(buffer) - width + 1, stride)]
 
     def part1(self, data) -> int:
         """How many trees are visible from outside the grid?"""
@@ -1,9 +1,13 @@
-from utils.puzzles.numbers import Point
+import random
+
+from utils.puzzles.geometry import Point
 from utils.solution import BaseSolution
 
 
 class Solution(BaseSolution):
 
+    copy_strategy = "none"
+
     MOVES = {
         "U": (0, 1),
         "D": (0, -1),
@@ -11,15 +15,16 @@ class Solution(BaseSolution):
         "R": (1, 0)
     }
 
-    def _catchup(self, head: Point, tail: Point):
-        """Move the tail to catch up with the head."""
+    def generate_input(self, scale: int, seed: int = 0) -> str:
+        rng = random.Random(seed)
+        return "".join(f"{rng.choice('UDLR')} {rng.randint(1, 20)}\n" for _ in range(2000 * scale))
+
+    def _catchup(self, head: Point, tail: Point) -> Point:
+        """Get the position of the tail after catching up with the head."""
         diff = head - tail
-        x = abs(diff.x)
-        y = abs(diff.y)
-        if (x > 1 and y <= 1) or (x <= 1 and y > 1):
-            tail.move(delta=diff.signage())
-        if x > 1 and y > 1:
-            tail.move(delta=diff.signage())
+        if abs(diff.x) > 1 or abs(diff.y) > 1:
+            return tail + diff.signage()
+        return tail
 
     def parse(self, raw: str):
         raw = raw.rstrip("\n")
@@ -39,9 +44,9 @@ class Solution(BaseSolution):
             # Do every step one increment at a time.
             for _ in range(step[1]):
                 delta = self.MOVES[step[0]]
-                head.move(delta=delta)
-                self._catchup(head, tail)
-                positions.add(tail.to_tuple())
+                head = head + delta
+                tail = self._catchup(head, tail)
+                positions.add(tail)
 
         return len(positions)
 
@@ -54,12 +59,12 @@ class Solution(BaseSolution):
             # Do every step one increment at a time.
             for _ in range(step[1]):
                 delta = self.MOVES[step[0]]
-                head.move(delta=delta)
+                head = head + delta
                 # Now catch up the other nine segments.
-                self._catchup(head, tail[0])
+                tail[0] = self._catchup(head, tail[0])
                 for idx in range(1, 9):
-                    self._catchup(tail[idx-1], tail[idx])
-                positions.add(tail[-1].to_tuple())
+                    tail[idx] = self._catchup(tail[idx-1], tail[idx])
+                positions.add(tail[-1])
 
         return len(positions)
 
@@ -3,10 +3,14 @@ from utils.solution import BaseSolution
 
 class Solution(BaseSolution):
 
-    def parse(self, raw: str):
-        raw = raw.rstrip("\n")
+    copy_strategy = "none"
+    input_mode = "lines"
+
+    def parse_stream(self, lines):
         instructions = []
-        for line in raw.splitlines():
+        for line in lines:
+            if not line:
+                continue
             cmd = line.split()
             if len(cmd) > 1:
                 cmd[1] = int(cmd[1])
@@ -27,16 +31,16 @@ class Solution(BaseSolution):
 
     def part2(self, data):
         """Render the image given by your program. What eight capital letters appear on your CRT?"""
-        cpu = CPU(data)
+        cpu = CPU(data, self.trace)
         cpu.process_crt()
-        for line in cpu.screen:
-            print(line)
+        return "\n".join(cpu.screen)
 
 
 class CPU:
 
-    def __init__(self, instructions: list):
+    def __init__(self, instructions: list, trace=None):
         self.instructions = instructions
+        self.trace = trace
 
         self.cycle = 0
         self.registerX = 1
@@ -51,7 +55,8 @@ class CPU:
             pixel = "#"
         else:
             pixel = "."
-        print(f"Drawing pixel in pos {draw_pos}: {pixel}, X at {self.registerX}")
+        if self.trace is not None:
+            self.trace("Drawing pixel in pos %d: %s, X at %d", draw_pos, pixel, self.registerX)
         self.screen[-1] = self.screen[-1] + pixel
 
     def process(self, key_cycles: list):
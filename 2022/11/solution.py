@@ -5,6 +5,11 @@ from utils.solution import BaseSolution
 
 class Solution(BaseSolution):
 
+    # Both parts move things around in place.
+    copy_strategy = "reparse"
+    # 10000 rounds take a while, but not this long.
+    time_budget = 60
+
     def parse(self, raw: str):
         raw = raw.rstrip("\n")
         monkeys = []
@@ -33,7 +38,7 @@ class Solution(BaseSolution):
                 monkey.inspect(data)
 
         activity.sort(reverse=True)
-        print(activity)
+        self.trace("Activity: %s", activity)
         return activity[0] * activity[1]
 
     def part2(self, data):
@@ -47,14 +52,13 @@ class Solution(BaseSolution):
 
         activity = [0 for _ in range(len(data))]
         for round in range(10000):
-            print(f"\r=== Round {round+1} ===", end="")
+            self.progress(round + 1, 10000)
             for monkey in data:
                 activity[monkey.id] += len(monkey.items)
                 monkey.inspect(data, False, prime_mult)
 
         activity.sort(reverse=True)
-        print("")
-        print(activity)
+        self.trace("Activity: %s", activity)
         return activity[0] * activity[1]
 
 
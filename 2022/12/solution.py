@@ -2,83 +2,72 @@ import math
 import random
 from collections import defaultdict
 
-from utils.puzzles.algorithms import dijkstra
-from utils.puzzles.geometry import Grid, Point
+from utils.puzzles.algorithms import a_star, bfs_grid
+from utils.puzzles.geometry import Grid
 from utils.solution import BaseSolution
 
 
 class Solution(BaseSolution):
 
-    def _get_distance(self, current: Point, neighbour: Point) -> float | None:
+    copy_strategy = "none"
+
+    def generate_input(self, scale: int, seed: int = 0) -> str:
+        # Climb steadily from west to east, with some pits which can only be left the way they were entered.
+        rng = random.Random(seed)
+        # Real height maps are 41 rows by 171 columns.
+        rows = max(3, round(41 * math.sqrt(scale)))
+        cols = max(30, round(171 * math.sqrt(scale)))
+        lines = []
+        for y in range(rows):
+            line = [chr(97 + min(25, x * 28 // cols)) if rng.random() > 0.1 else "a" for x in range(cols)]
+            if y == rows // 2:
+                line[0], line[-1] = "S", "E"
+            lines.append("".join(line))
+        return "\n".join(lines) + "\n"
+
+    def _get_distance(self, current: int, neighbour: int) -> float | None:
         """Get the distance between two neighbouring nodes, or None if the path is impassable."""
         if self.nodes[neighbour] - self.nodes[current] > 1:
             return None
         return 1
 
-    def parse(self, raw: str):
-        rows = raw.count("\n")
-        raw = raw.rstrip("\n")
+    def parse(self, raw: str) -> tuple[Grid, int, int]:
+        lines = raw.rstrip("\n").splitlines()
         heights = []
-        for line in raw.splitlines():
+        start = end = None
+        for line in lines:
             for char in line:
-                # Starting point
+                # The starting point has elevation a, and the ending point elevation z.
                 if char == "S":
-                    heights.append(0)
-                # Ending point
+                    start = len(heights)
+                    char = "a"
                 elif char == "E":
-                    heights.append(27)
-                # Otherwise, a = 1, b = 2, ... z = 26
-                else:
-                    heights.append(ord(char) - 96)
-
-        return Grid(heights, nrow=rows)
-
-    def part1(self, data: Grid):
-        """What is the fewest steps required to move from your current position to the end?
+                    end = len(heights)
+                    char = "z"
+                # a = 1, b = 2, ... z = 26
+                heights.append(ord(char) - 96)
 
-        Off by two, but only in puzzle input. No clue why.
-        """
-        start = data.index(0)
-        end = data.index(27)
-        self.nodes = data
-        path = dijkstra(data, start, end, self._get_distance)
+        return Grid(heights, nrow=len(lines), typecode="b"), start, end
 
-        return path
+    def part1(self, data: tuple[Grid, int, int]):
+        """What is the fewest steps required to move from your current position to the end?"""
+        grid, start, end = data
+        self.nodes = grid
+        # Every step costs one, so the Manhattan distance to the end never overestimates what is left.
+        result = a_star(grid, start, end, self._get_distance)
+        self.trace("Expanded %d of %d squares", result.expanded, grid.num_rows * grid.num_cols)
 
-    def part2(self, data):
-        """Copy-pasted with minor changes cause I cannot be bothered to write a general one.
+        # Just like in part 2, an end which cannot be reached is -1 steps away.
+        return -1 if result.target is None else result.distance()
 
-        Off by two! I don't get why.
-        """
-        end = data.index(27)
-        # 1 - Mark all nodes as unvisited.
-        unvisited = [Point(x, y) for x in range(data.num_cols) for y in range(data.num_rows)]
-        # 2 - Assign to every node a tentative distance value.
-        nodes = Grid(size=data.get_size(), default=math.inf)
-        nodes[end] = 0
-        current = end
-        while len(unvisited) > 0:
-            # 3 - For the current node, consider all neighbours and calculate their tentative distances.
-            neighbours = nodes.get_neighbours(current)
-            for n in neighbours:
-                # Only consider unvisited ones.
-                if n in unvisited:
-                    distance = 1 if data[n] - data[current] >= -1 else None
-                    # If the neighbour should not be considered for some special reason, the distance will be None.
-                    if distance is not None and nodes[current] + distance < nodes[n]:
-                        nodes[n] = nodes[current] + distance
-            # 4 - When we are done considering neighbours, mark the current node as visited.
-            unvisited.remove(current)
-            if data[current] == 1 or data[current] == 0:
-                break
-            # 5 - Select the unvisited node with the smallest tentative distance as the new current node.
-            current = min(unvisited, key=lambda v: nodes[v])
-            # 6 - If the destination node is marked visited, or the shortest available path is infinity, stop.
-            if nodes[current] == math.inf:
-                break
+    def part2(self, data: tuple[Grid, int, int]):
+        """What is the fewest steps required to move from any square with elevation a to the end?"""
+        grid, _, end = data
+        # Climb from all the lowest squares at once, so the end is reached from whichever of them is closest.
+        lowest = [idx for idx, height in enumerate(grid.values()) if height == 1]
+        steps = bfs_grid(grid, lowest, lambda current, neighbour: neighbour - current <= 1)
 
-        # print(nodes.pretty_print())
-        return nodes[current]
+        return steps[end]
 
 
 if __name__ == "__main__":
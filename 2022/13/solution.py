@@ -1,9 +1,27 @@
-from utils.puzzles.algorithms import merge_sort
+import random
+
+from utils.puzzles.algorithms import rank_of, three_way
 from utils.solution import BaseSolution
 
 
 class Solution(BaseSolution):
 
+    copy_strategy = "none"
+
+    def _generate_packet(self, rng: random.Random, depth: int = 0) -> str:
+        items = []
+        for _ in range(rng.randint(0, 5)):
+            if depth < 4 and rng.random() < 0.3:
+                items.append(self._generate_packet(rng, depth + 1))
+            else:
+                items.append(str(rng.randint(0, 10)))
+        return "[" + ",".join(items) + "]"
+
+    def generate_input(self, scale: int, seed: int = 0) -> str:
+        rng = random.Random(seed)
+        pairs = [f"{self._generate_packet(rng)}\n{self._generate_packet(rng)}" for _ in range(150 * scale)]
+        return "\n\n".join(pairs) + "\n"
+
     def _compare(self, left_packet: list, right_packet: list) -> bool:
         """Compare two packets against each other. Returns true if they are in the right order."""
         idx = -1
@@ -72,10 +90,10 @@ class Solution(BaseSolution):
         data_flat.append([[2]])
         data_flat.append([[6]])
 
-        # Sort the packets and find the indices of the divider packets.
-        sorted_packets = merge_sort(data_flat, self._compare)
-        div_1 = sorted_packets.index([[2]]) + 1
-        div_2 = sorted_packets.index([[6]]) + 1
+        # Only the positions of the divider packets matter, which needs no sorting of all the others.
+        compare = three_way(self._compare)
+        div_1 = rank_of(data_flat, data_flat[-2], compare)
+        div_2 = rank_of(data_flat, data_flat[-1], compare)
 
         return div_1 * div_2
 
@@ -1,3 +1,5 @@
+import math
+import random
 import re
 
 from utils.puzzles.geometry import DictGrid, Line, Point
@@ -6,6 +8,32 @@ from utils.solution import BaseSolution
 
 class Solution(BaseSolution):
 
+    copy_strategy = "none"
+    # The sand never stops falling if the lowest rock is wrong.
+    time_budget = 60
+
+    def generate_input(self, scale: int, seed: int = 0) -> str:
+        # Sand piles up in a triangle below the origin, so make it deeper rather than just adding more rock.
+        # Keeping all rock deeper below the origin than it reaches out to either side means that the sand can never
+        # pile up all the way to the origin in part 1, but always ends up falling off into infinity.
+        rng = random.Random(seed)
+        # Real scans reach down to a depth of about 170, along roughly 150 paths of a dozen points each.
+        depth = round(170 * math.sqrt(scale))
+        reach = depth // 2
+        # A wide ledge at the bottom keeps the sand from falling off into infinity straight away.
+        lines = [f"{500 - reach},{depth + 2} -> {500 + reach},{depth + 2}"]
+        for _ in range(150 * scale):
+            x, y = rng.randint(500 - reach, 500 + reach), rng.randint(reach + 1, depth)
+            path = [f"{x},{y}"]
+            for _ in range(rng.randint(5, 20)):
+                if rng.random() < 0.5:
+                    x = min(500 + reach, max(500 - reach, x + rng.randint(-8, 8)))
+                else:
+                    y = min(depth, max(reach + 1, y + rng.randint(-8, 8)))
+                path.append(f"{x},{y}")
+            lines.append(" -> ".join(path))
+        return "\n".join(lines) + "\n"
+
     def parse(self, raw: str):
         raw = raw.rstrip("\n")
         lines = []
@@ -28,20 +56,23 @@ class Solution(BaseSolution):
 
         # Set up sand and the directions it can fall in.
         sand_origin = Point(500, 0)
-        sand = sand_origin.copy()
+        sand = sand_origin
+        settled = 0
         down, down_left, down_right = Point(0, 1), Point(-1, 1), Point(1, 1)
         while sand.y < lowest_point[1] + 1:
             if not grid.get(sand + down):
-                sand.move(delta=down)
+                sand = sand + down
             elif not grid.get(sand + down_left):
-                sand.move(delta=down_left)
+                sand = sand + down_left
             elif not grid.get(sand + down_right):
-                sand.move(delta=down_right)
+                sand = sand + down_right
             else:
                 # If the sand cannot move anywhere else, it settles.
                 grid.add_point(sand, 5)
                 # print(f"Settled at {sand}")
-                sand = sand_origin.copy()
+                settled += 1
+                self.progress(settled)
+                sand = sand_origin
 
         # Return the number of sand kernels in the grid.
         return len([s for s in filter(lambda x: x[1] == 5, grid._grid.items())])
@@ -55,25 +86,30 @@ class Solution(BaseSolution):
 
         # Set up sand and the directions it can fall in.
         sand_origin = Point(500, 0)
-        sand = sand_origin.copy()
+        sand = sand_origin
+        settled = 0
         down, down_left, down_right = Point(0, 1), Point(-1, 1), Point(1, 1)
         while grid.get(sand_origin) is None:
             # Assume an infinite floor at lowest+2
             if sand.y == lowest_point[1] + 1:
                 grid.add_point(sand, 5)
-                sand = sand_origin.copy()
+                settled += 1
+                self.progress(settled)
+                sand = sand_origin
             # Proceed as before.
             if not grid.get(sand + down):
-                sand.move(delta=down)
+                sand = sand + down
             elif not grid.get(sand + down_left):
-                sand.move(delta=down_left)
+                sand = sand + down_left
             elif not grid.get(sand + down_right):
-                sand.move(delta=down_right)
+                sand = sand + down_right
             else:
                 # If the sand cannot move anywhere else, it settles.
                 grid.add_point(sand, 5)
                 # print(f"Settled at {sand}")
-                sand = sand_origin.copy()
+                settled += 1
+                self.progress(settled)
+                sand = sand_origin
 
         # Return the number of sand kernels in the grid.
         return len([s for s in filter(lambda x: x[1] == 5, grid._grid.items())])
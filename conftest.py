@@ -0,0 +1 @@
+# Lets pytest find the solutions and utils from the project root, however it is started.
@@ -1,27 +1,158 @@
-import importlib
+import contextlib
 import logging
 import sys
-from argparse import ArgumentParser
+import time
+from argparse import ArgumentParser, ArgumentTypeError, BooleanOptionalAction
+from pathlib import Path
 
-from utils import constants, filehandler
+from utils import constants, filehandler, misc
+from utils.lazy import lazy_import
+
+# Most commands only need a few of these, so avoid paying for the others on every start.
+batch = lazy_import("utils.batch")
+bench = lazy_import("utils.bench")
+profiling = lazy_import("utils.profiling")
+runner = lazy_import("utils.runner")
+scaling = lazy_import("utils.scaling")
+subprocess = lazy_import("subprocess")
+supervisor = lazy_import("utils.supervisor")
+telemetry = lazy_import("utils.telemetry")
+timing = lazy_import("utils.timing")
+watch = lazy_import("utils.watch")
 
 _log = logging.getLogger(constants.ROOT_LOGGER)
 
 
+def _cli_batch(args):
+    output = Path(args.output or f"batch-2022-{args.day:02}.jsonl")
+    solved, failed = batch.solve_batch(2022, args.day, args.pattern, output, args.jobs)
+    _log.info(f"Solved {solved} inputs, {failed} failed. Results are in {output}")
+    if failed:
+        sys.exit(1)
+
+
+def _cli_bench(args):
+    if args.all:
+        days = filehandler.get_days(2022)
+    elif args.days:
+        days = args.days
+    else:
+        days = [args.day if args.day >= 0 else filehandler.get_latest_day(2022)]
+    regressions = run_bench(2022, days, args.test_input, args.repeats, args.warmup, args.save, args.compare,
+                            args.threshold)
+    if regressions:
+        sys.exit(1)
+
+
+def _cli_fetch(args):
+    filehandler.fetch_puzzle_inputs(args.year, args.jobs, args.base_url)
+
+
 def _cli_next(args):
     next_day = filehandler.get_latest_day(args.year) + 1
     filehandler.setup_day(args.year, next_day)
 
 
 def _cli_run(args):
-    run(2022, args.day, args.test_input)
+    if args.all or args.days:
+        days = filehandler.get_days(2022) if args.all else args.days
+        # Any one runaway day would hold up the whole summary, which only reports wall-clock times anyway.
+        enforce_budgets = args.budgets is not False
+        run_all(2022, days, args.test_input, jobs=args.jobs, timings=args.timings, use_cache=not args.no_cache,
+                time_budget=args.time_budget, memory_budget=args.memory_budget, telemetry_target=args.telemetry,
+                telemetry_interval=args.telemetry_interval, enforce_budgets=enforce_budgets)
+    else:
+        run(2022, args.day, args.test_input, timings=args.timings, use_cache=not args.no_cache, profile=args.profile,
+            top=args.top, time_budget=args.time_budget, memory_budget=args.memory_budget,
+            telemetry_target=args.telemetry, telemetry_interval=args.telemetry_interval,
+            enforce_budgets=bool(args.budgets))
+
+
+def _cli_scale(args):
+    run_scale(2022, args.day, args.scales, args.seed, args.repeats, args.max_seconds)
+
+
+def _cli_watch(args):
+    day = args.day if args.day >= 0 else filehandler.get_latest_day(2022)
+    try:
+        watch.Watcher(2022, day, not args.puzzle_input, args.interval).run()
+    except KeyboardInterrupt:
+        _log.info("Stopped watching")
+
+
+def _day_range(spec: str) -> list[int]:
+    """Parse a selection of days from the command line, so that argparse reports it if it is invalid."""
+    try:
+        days = misc.parse_day_range(spec)
+    except ValueError as e:
+        raise ArgumentTypeError(f"'{spec}' is not a valid selection of days: {e}")
+    if not days:
+        raise ArgumentTypeError(f"'{spec}' does not select any days")
+    if days[0] < 1 or days[-1] > constants.LAST_DAY:
+        raise ArgumentTypeError(f"'{spec}' selects days outside of 1-{constants.LAST_DAY}")
+    return days
+
+
+def _positive_int(value: str) -> int:
+    """Parse a number from the command line which must be at least one."""
+    try:
+        number = int(value)
+    except ValueError:
+        raise ArgumentTypeError(f"'{value}' is not a whole number")
+    if number < 1:
+        raise ArgumentTypeError(f"must be at least 1, not {number}")
+    return number
+
+
+def _scale_list(spec: str) -> list[int]:
+    """Parse a comma-separated list of input scales from the command line, each of which must be at least one."""
+    scales = [_positive_int(scale.strip()) for scale in spec.split(",") if scale.strip()]
+    if not scales:
+        raise ArgumentTypeError(f"'{spec}' does not contain any scales")
+    return scales
 
 
 def get_cli() -> ArgumentParser:
     """Get the command line interface for this project."""
     parser = ArgumentParser(description="Advent of Code")
+    parser.add_argument("--startup-profile", action="store_true",
+                        help="run the given command and report which imports slowed down its start the most")
     subparsers = parser.add_subparsers()
 
+    batch_parser = subparsers.add_parser("batch", help="solve a day for every input file matching a pattern")
+    batch_parser.set_defaults(func=_cli_batch)
+    batch_parser.add_argument("day", type=int, help="the day of AoC to solve")
+    batch_parser.add_argument("pattern", help="a glob pattern for the input files, e.g. 'inputs/12/**/*.txt'")
+    batch_parser.add_argument("-o", "--output",
+                              help="the JSONL file to append results to, defaults to batch-<year>-<day>.jsonl. "
+                                   "Inputs which already have a successful result in it are skipped")
+    batch_parser.add_argument("-j", "--jobs", type=_positive_int, default=None,
+                              help="the number of processes to use, defaults to all CPUs")
+
+    bench_parser = subparsers.add_parser("bench", help="benchmark the solutions for one or more days")
+    bench_parser.set_defaults(func=_cli_bench)
+    bench_parser.add_argument("day", nargs="?", type=int, default=-1, help="the day of AoC to benchmark")
+    bench_parser.add_argument("-t", "--test-input", action="store_true", help="if passed, run on test input only")
+    bench_parser.add_argument("--all", action="store_true", help="benchmark every day of the year")
+    bench_parser.add_argument("--days", type=_day_range, help="benchmark a selection of days, e.g. '3-9,12'")
+    bench_parser.add_argument("-n", "--repeats", type=_positive_int, default=10,
+                              help="the number of measured runs per day")
+    bench_parser.add_argument("-w", "--warmup", type=int, default=2, help="the number of unmeasured runs per day")
+    bench_parser.add_argument("--save", action="store_true", help="store the results as the new baseline")
+    bench_parser.add_argument("--compare", action="store_true",
+                              help="compare against the stored baseline and fail on any regressions")
+    bench_parser.add_argument("--threshold", type=float, default=0.1,
+                              help="how much slower than the baseline a phase may get before it counts as a "
+                                   "regression, as a fraction of both its median and its fastest run")
+
+    fetch_parser = subparsers.add_parser("fetch", help="download all missing puzzle inputs which have unlocked")
+    fetch_parser.set_defaults(func=_cli_fetch)
+    fetch_parser.add_argument("--year", type=int, default=2022, help="the year to download puzzle inputs for")
+    fetch_parser.add_argument("-j", "--jobs", type=_positive_int, default=4,
+                              help="the maximum number of concurrent downloads")
+    fetch_parser.add_argument("--base-url", default=constants.AOC_URL,
+                              help="the server to download from, e.g. a local stub server for testing")
+
     next_parser = subparsers.add_parser("next", help="create files for a new day")
     next_parser.set_defaults(func=_cli_next)
     next_parser.add_argument("year", nargs="?", type=int, default=2022, help="the year to create a new day for")
@@ -31,6 +162,51 @@ def get_cli() -> ArgumentParser:
     # run_parser.add_argument("year", type=int, default=2022, help="the year of AoC to select")
     run_parser.add_argument("day", nargs="?", type=int, default=-1, help="the day of AoC to run")
     run_parser.add_argument("-t", "--test-input", action="store_true", help="if passed, run on test input only")
+    run_parser.add_argument("--all", action="store_true", help="run every day of the year in parallel")
+    run_parser.add_argument("--days", type=_day_range, help="run a selection of days in parallel, e.g. '3-9,12'")
+    run_parser.add_argument("-j", "--jobs", type=_positive_int, default=None,
+                            help="the number of processes to use with --all or --days, defaults to all CPUs")
+    run_parser.add_argument("--timings", choices=("text", "json"),
+                            help="report how long each phase took, as a table or as JSON on stdout")
+    run_parser.add_argument("--no-cache", action="store_true", help="always solve from scratch")
+    run_parser.add_argument("--profile", nargs="?", const="all", choices=("parse", "part1", "part2", "all"),
+                            help="profile one phase, or all of them, and save the results to .cache/profiles")
+    run_parser.add_argument("--top", type=int, default=15,
+                            help="the number of hot functions to list when profiling")
+    run_parser.add_argument("--budgets", action=BooleanOptionalAction, default=None,
+                            help="enforce the time and memory budgets the solutions declare, which is the default for "
+                                 "--all and --days only")
+    run_parser.add_argument("--time-budget", type=float,
+                            help="kill any part which runs for longer than this many seconds, overriding the "
+                                 "budget the solution declares")
+    run_parser.add_argument("--memory-budget", type=int,
+                            help="kill any part whose memory usage grows beyond this many MiB, overriding the "
+                                 "budget the solution declares")
+    run_parser.add_argument("--telemetry", metavar="TARGET",
+                            help="where the progress and traces of solutions go: 'log', 'none' (the default) or a "
+                                 "file to append to. Only files make sense with --all or --days")
+    run_parser.add_argument("--telemetry-interval", type=float, default=0.5,
+                            help="show the same kind of telemetry at most this often, in seconds")
+
+    scale_parser = subparsers.add_parser("scale", help="measure how a solution copes with growing generated input")
+    scale_parser.set_defaults(func=_cli_scale)
+    scale_parser.add_argument("day", nargs="?", type=int, default=-1, help="the day of AoC to measure")
+    scale_parser.add_argument("--scales", type=_scale_list, default="1,10,100",
+                              help="the sizes of input to generate, as multiples of a real input, e.g. '1,4,16,64'")
+    scale_parser.add_argument("--seed", type=int, default=0, help="the seed for generating inputs")
+    scale_parser.add_argument("-n", "--repeats", type=_positive_int, default=1,
+                              help="the number of runs per scale, of which the fastest one counts")
+    scale_parser.add_argument("--max-seconds", type=float, default=60,
+                              help="kill any part which takes longer than this, and skip any larger scales once a "
+                                   "single run does")
+
+    watch_parser = subparsers.add_parser("watch", help="solve a day again whenever its solution or input changes")
+    watch_parser.set_defaults(func=_cli_watch)
+    watch_parser.add_argument("day", nargs="?", type=int, default=-1, help="the day of AoC to watch")
+    watch_parser.add_argument("-p", "--puzzle-input", action="store_true",
+                              help="if passed, solve the puzzle input rather than the test input")
+    watch_parser.add_argument("--interval", type=float, default=0.2,
+                              help="how often to check for changes, in seconds")
 
     return parser
 
@@ -38,24 +214,132 @@ def get_cli() -> ArgumentParser:
 def main():
     parser = get_cli()
     args = parser.parse_args()
-    setup_logger()
+    if args.startup_profile:
+        profile_startup([arg for arg in sys.argv[1:] if arg != "--startup-profile"])
+        return
+    # Keep stdout clean for anything that is meant to be machine-readable.
+    json_output = getattr(args, "timings", None) == "json"
+    setup_logger(sys.stderr if json_output else sys.stdout)
     # Execute the function corresponding to the chosen subcommand.
     args.func(args)
 
 
-def run(year: int, day: int, test_input: bool):
+def profile_startup(argv: list[str], top: int = 15):
+    """Run this program again under '-X importtime' and summarise where its startup time went."""
+    start = time.perf_counter()
+    process = subprocess.run([sys.executable, "-X", "importtime", __file__, *argv], capture_output=True, text=True)
+    elapsed = time.perf_counter() - start
+    sys.stdout.write(process.stdout)
+
+    imports = []
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:"):
+            sys.stderr.write(line + "\n")
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        # The header line has no numbers in it.
+        if not self_us.strip().isdigit():
+            continue
+        # Nested imports are indented by two spaces per level.
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        imports.append((int(self_us), int(cumulative_us), depth, name.strip()))
+
+    total_us = sum(imp[1] for imp in imports if imp[2] == 0)
+    print("\n---------- STARTUP PROFILE ----------")
+    print(f"Wall-clock time: {elapsed * 1000:.1f}ms, of which {total_us / 1000:.1f}ms were spent on "
+          f"{len(imports)} imports")
+    print(f"{'self [ms]': >10} | {'cumulative [ms]': >15} | module")
+    for self_us, cumulative_us, depth, name in sorted(imports, key=lambda imp: imp[1], reverse=True)[:top]:
+        print(f"{self_us / 1000: >10.2f} | {cumulative_us / 1000: >15.2f} | {'  ' * depth}{name}")
+    if process.returncode != 0:
+        sys.exit(process.returncode)
+
+
+def run(year: int, day: int, test_input: bool, timings: str = None, use_cache: bool = True, profile: str = None,
+        top: int = 15, time_budget: float = None, memory_budget: int = None, telemetry_target: str = None,
+        telemetry_interval: float = 0.5, enforce_budgets: bool = False):
     """Run the solution for a specific day."""
     if day < 0:
         day = filehandler.get_latest_day(year)
     _log.info(f"Running AoC {year} Day {day}")
-    module = importlib.import_module(f"{year}.{day:02}.solution")
+    module = runner.import_solution(year, day)
     solution = module.Solution()
-    solution.solve(test_input)
+    profiler = None
+    if profile:
+        profiler = profiling.PhaseProfiler(profile)
+        # Stored answers or parsed data would leave nothing to profile.
+        use_cache = False
+    try:
+        # Keep stdout machine-readable if JSON was requested.
+        with contextlib.redirect_stdout(sys.stderr if timings == "json" else sys.stdout), \
+                telemetry.open_telemetry(telemetry_target, telemetry_interval, f"{year} Day {day}") as channel:
+            result = solution.solve(test_input, use_cache, profiler, time_budget=time_budget,
+                                    memory_budget=memory_budget, telemetry=channel, enforce_budgets=enforce_budgets)
+    except supervisor.BudgetExceeded as e:
+        _log.error(e)
+        sys.exit(1)
+    if timings == "json":
+        print(timing.to_json([result]))
+    elif timings == "text":
+        print(timing.format_timings([result]))
+    if profiler:
+        profiler.save(year, day)
+        # Keep stdout machine-readable if JSON was requested.
+        print(profiler.summary(top), file=sys.stderr if timings == "json" else sys.stdout)
+
+
+def run_all(year: int, days: list[int], test_input: bool, jobs: int = None, timings: str = None,
+            use_cache: bool = True, time_budget: float = None, memory_budget: int = None, telemetry_target: str = None,
+            telemetry_interval: float = 0.5, enforce_budgets: bool = True):
+    """Run the solutions for several days in parallel and print a summary of the results."""
+    start = time.perf_counter()
+    results = runner.run_days(year, days, test_input, jobs=jobs, use_cache=use_cache, time_budget=time_budget,
+                              memory_budget=memory_budget, telemetry_target=telemetry_target,
+                              telemetry_interval=telemetry_interval, enforce_budgets=enforce_budgets)
+    if timings == "json":
+        print(timing.to_json([r.result for r in results if r.result]))
+        return
+    print(runner.format_summary(results, time.perf_counter() - start))
+    if timings == "text":
+        print(timing.format_timings([r.result for r in results if r.result]))
+
+
+def run_bench(year: int, days: list[int], test_input: bool, repeats: int, warmup: int, save: bool, compare: bool,
+              threshold: float) -> list[str]:
+    """Benchmark the solutions for several days and return any regressions compared to the baseline."""
+    stats = {day: bench.bench_day(year, day, test_input, repeats, warmup) for day in days}
+    print(bench.format_stats(stats))
+
+    regressions = []
+    if compare:
+        regressions = bench.compare(stats, bench.load_baseline(year, test_input), threshold)
+        for regression in regressions:
+            _log.warning(f"Regression: {regression}")
+        if not regressions:
+            _log.info(f"No phase got slower than the baseline by more than {threshold:.0%}.")
+    if save:
+        bench.save_baseline(stats, year, test_input)
+    return regressions
+
+
+def run_scale(year: int, day: int, scales: list[int], seed: int, repeats: int, max_seconds: float):
+    """Solve generated inputs of growing size and report how quickly the time of each phase grows."""
+    if day < 0:
+        day = filehandler.get_latest_day(year)
+    try:
+        points = scaling.measure_day(year, day, scales, seed, repeats, max_seconds)
+    except NotImplementedError:
+        _log.error(f"The solution for Day {day} cannot generate its own input yet, see generate_input")
+        sys.exit(1)
+    if not points:
+        _log.error(f"Day {day} could not be measured at any scale")
+        sys.exit(1)
+    print(scaling.format_report(points))
 
 
-def setup_logger():
+def setup_logger(stream=sys.stdout):
     _log.setLevel(logging.DEBUG)
-    handler = logging.StreamHandler(sys.stdout)
+    handler = logging.StreamHandler(stream)
     handler.setFormatter(logging.Formatter("{levelname}:{name}:{message}", style="{"))
     _log.addHandler(handler)
 
@@ -0,0 +1,29 @@
+import unittest
+
+from utils import runner
+
+EXAMPLE = "Sabqponm\nabcryxxl\naccszExk\nacctuvwj\nabdefghi\n"
+
+
+class TestDay12(unittest.TestCase):
+
+    def setUp(self):
+        self.solution = runner.import_solution(2022, 12).Solution()
+
+    def solve(self, raw: str) -> tuple:
+        data = self.solution.parse(raw)
+        return self.solution.part1(data), self.solution.part2(data)
+
+    def test_example(self):
+        self.assertEqual(self.solve(EXAMPLE), (31, 29))
+
+    def test_start_is_a_and_end_is_z(self):
+        # Leaving the start onto a b, and reaching the end from a y, are both just one step up.
+        self.assertEqual(self.solve("SbcdefghijklmnopqrstuvwxyE\n"), (25, 25))
+
+    def test_unreachable(self):
+        self.assertEqual(self.solve("SE"), (-1, -1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import math
+import random
+import unittest
+
+from utils.puzzles.algorithms import a_star, bfs_grid, bidirectional_search, dijkstra_grid
+from utils.puzzles.geometry import Grid
+
+# Cells this high cannot be entered at all.
+WALL = 9
+
+
+def random_grid(rng: random.Random) -> Grid:
+    rows, cols = rng.randint(1, 7), rng.randint(1, 7)
+    values = [rng.choice((0, 1, 2, 3, WALL)) for _ in range(rows * cols)]
+    return Grid(values, ncol=cols, typecode="b")
+
+
+def passable(a, b) -> bool:
+    return b != WALL and b - a <= 1
+
+
+class TestGridSearch(unittest.TestCase):
+    """Checks every search against dijkstra_grid on lots of small random grids."""
+
+    def cases(self, count: int = 300):
+        rng = random.Random(12)
+        for _ in range(count):
+            grid = random_grid(rng)
+            size = grid.num_rows * grid.num_cols
+            yield grid, rng.randrange(size), rng.randrange(size), rng.random() < 0.5, rng.random() < 0.5
+
+    def assert_valid_path(self, grid: Grid, path: list, start: int, end: int, step, distance: float):
+        self.assertEqual(path[0], start)
+        self.assertEqual(path[-1], end)
+        total = 0
+        for a, b in zip(path, path[1:]):
+            cost = step(a, b)
+            self.assertIsNotNone(cost)
+            total += cost
+        self.assertEqual(total, distance)
+
+    def test_weighted_searches(self):
+        for grid, start, end, diagonal, wrap in self.cases():
+            values = grid._values
+
+            def step(a, b):
+                return 1 + values[b] if passable(values[a], values[b]) else None
+
+            expected = dijkstra_grid(grid, [start], step, diagonal=diagonal, wrap=wrap).distance(end)
+            for search in (a_star, bidirectional_search):
+                with self.subTest(search=search.__name__, grid=grid.pretty_print(), start=start, end=end,
+                                  diagonal=diagonal, wrap=wrap):
+                    result = search(grid, start, end, step, diagonal=diagonal, wrap=wrap, paths=True)
+                    self.assertEqual(result.distance(), expected)
+                    if expected == math.inf:
+                        self.assertEqual(result.path(), [])
+                    else:
+                        self.assert_valid_path(grid, result.path(), start, end, step, expected)
+
+    def test_bfs_grid(self):
+        for grid, start, end, diagonal, wrap in self.cases():
+            values = grid._values
+
+            def step(a, b):
+                return 1 if passable(values[a], values[b]) else None
+
+            with self.subTest(grid=grid.pretty_print(), start=start, diagonal=diagonal, wrap=wrap):
+                forward = dijkstra_grid(grid, [start], step, diagonal=diagonal, wrap=wrap).distances
+                backward = dijkstra_grid(grid, [start], lambda a, b: step(b, a), diagonal=diagonal,
+                                         wrap=wrap).distances
+                for reverse, expected in ((False, forward), (True, backward)):
+                    steps = bfs_grid(grid, [start], passable, reverse=reverse, diagonal=diagonal, wrap=wrap)
+                    self.assertEqual(list(steps.values()), [-1 if d == math.inf else d for d in expected.values()])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from utils import filehandler, runner
+
+
+def with_source(solution, old: str, new: str):
+    """Make the solution believe its module contains changed source code."""
+    source = solution._get_source()
+    assert old.encode("utf-8") in source
+    solution._get_source = lambda: source.replace(old.encode("utf-8"), new.encode("utf-8"))
+    return solution
+
+
+class TestAnswerStore(unittest.TestCase):
+
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        patcher = mock.patch.object(filehandler, "get_cache_dir", return_value=Path(tmp_dir.name))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_round_trip(self):
+        filehandler.save_answer(2022, 12, 1, "input", "source", 31, 1000)
+        entry = filehandler.load_answer(2022, 12, 1, "input", "source")
+        self.assertEqual((entry["answer"], entry["elapsed_ns"]), (31, 1000))
+        self.assertIsNone(filehandler.load_answer(2022, 12, 1, "other input", "source"))
+        self.assertIsNone(filehandler.load_answer(2022, 12, 2, "input", "source"))
+
+    def test_changed_source_drops_answers(self):
+        filehandler.save_answer(2022, 12, 1, "input", "old", 31, 1000)
+        filehandler.save_answer(2022, 12, 1, "other input", "old", 32, 1000)
+        self.assertIsNone(filehandler.load_answer(2022, 12, 1, "input", "new"))
+        # Answers of the old version are gone for every input, even if the old version came back.
+        self.assertIsNone(filehandler.load_answer(2022, 12, 1, "other input", "old"))
+
+    def test_solve_uses_stored_answers(self):
+        solution = runner.import_solution(2022, 12).Solution()
+        with runner.quiet_output():
+            first = solution.solve(True, use_cache=True)
+            second = runner.import_solution(2022, 12).Solution().solve(True, use_cache=True)
+        self.assertEqual(first.cached_parts, {})
+        self.assertEqual(set(second.cached_parts), {1, 2})
+        self.assertEqual(second.answers, first.answers)
+
+
+class TestPartSourceHash(unittest.TestCase):
+
+    def setUp(self):
+        self.module = runner.import_solution(2022, 12)
+        self.before = [self.module.Solution()._get_part_source_hash(part) for part in (1, 2)]
+
+    def test_other_part_does_not_count(self):
+        changed = with_source(self.module.Solution(), "        return steps[end]", "        return steps[end] + 0")
+        self.assertEqual(changed._get_part_source_hash(1), self.before[0])
+        self.assertNotEqual(changed._get_part_source_hash(2), self.before[1])
+
+    def test_shared_code_counts(self):
+        changed = with_source(self.module.Solution(), "            return None\n        return 1",
+                              "            return None\n        return 2")
+        self.assertNotEqual(changed._get_part_source_hash(1), self.before[0])
+        self.assertNotEqual(changed._get_part_source_hash(2), self.before[1])
+
+    def test_library_counts(self):
+        solution = self.module.Solution()
+        solution._library_hash = "0" * 64
+        self.assertNotEqual(solution._get_part_source_hash(1), self.before[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
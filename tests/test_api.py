@@ -0,0 +1,64 @@
+import importlib.util
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from utils import constants
+from utils.api import APIHandler
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Serves the puzzle input of every day but the 13th, and remembers who asked."""
+    requests = []
+
+    def do_GET(self):
+        self.requests.append((self.path, self.headers.get("Cookie"), self.headers.get("User-Agent")))
+        parts = self.path.strip("/").split("/")
+        if len(parts) != 4 or parts[1] != "day" or parts[3] != "input" or parts[2] == "13":
+            self.send_error(404)
+            return
+        body = f"input for day {parts[2]}\n".encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@unittest.skipUnless(importlib.util.find_spec("requests"), "fetching needs requests")
+class TestAPIHandler(unittest.TestCase):
+
+    def setUp(self):
+        StubHandler.requests = []
+        server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+        thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+        thread.start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        self.handler = APIHandler("secret", f"http://127.0.0.1:{server.server_port}", max_connections=3,
+                                  min_interval=0)
+
+    def test_get_puzzle_inputs(self):
+        results = dict(self.handler.get_puzzle_inputs(2022, [1, 2, 13, 25]))
+        self.assertEqual(results[1], "input for day 1\n")
+        self.assertEqual(results[25], "input for day 25\n")
+        self.assertIsInstance(results[13], ConnectionError)
+        self.assertEqual(sorted(path for path, _, _ in StubHandler.requests),
+                         sorted(f"/2022/day/{day}/input" for day in (1, 2, 13, 25)))
+        for _, cookie, user_agent in StubHandler.requests:
+            self.assertEqual(cookie, "session=secret")
+            self.assertEqual(user_agent, constants.USER_AGENT)
+
+    def test_requests_are_spaced_out(self):
+        self.handler.min_interval = 0.1
+        start = time.monotonic()
+        list(self.handler.get_puzzle_inputs(2022, [1, 2, 3]))
+        # However many run at once, the second and third request each have to wait their turn.
+        self.assertGreaterEqual(time.monotonic() - start, 0.2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,43 @@
+import json
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from utils import batch, filehandler
+
+
+class TestBatch(unittest.TestCase):
+
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.dir = Path(tmp_dir.name)
+        self.output = self.dir / "out.jsonl"
+        for name in ("a", "b"):
+            shutil.copy(filehandler.get_test_input_file(2022, 1), self.dir / f"{name}.txt")
+        (self.dir / "bad.txt").write_text("not a number\n", encoding="utf-8")
+
+    def records(self) -> list[dict]:
+        with open(self.output, "r", encoding="utf-8") as file:
+            return [json.loads(line) for line in file]
+
+    def test_solve_and_resume(self):
+        pattern = str(self.dir / "*.txt")
+        self.assertEqual(batch.solve_batch(2022, 1, pattern, self.output, jobs=2), (2, 1))
+        solved = [r for r in self.records() if r["error"] is None]
+        self.assertEqual([r["answers"] for r in solved], [{"part1": 24000, "part2": 45000}] * 2)
+        # Only the input which failed is tried again.
+        self.assertEqual(batch.solve_batch(2022, 1, pattern, self.output, jobs=2), (0, 1))
+        self.assertEqual(len(self.records()), 4)
+
+    def test_load_done_skips_failures_and_cut_off_lines(self):
+        with open(self.output, "w", encoding="utf-8") as file:
+            file.write(json.dumps({"input": "a", "error": None}) + "\n")
+            file.write(json.dumps({"input": "b", "error": "ValueError: nope"}) + "\n")
+            file.write('{"input": "c", "err')
+        self.assertEqual(batch.load_done(self.output), {"a"})
+
+
+if __name__ == "__main__":
+    unittest.main()
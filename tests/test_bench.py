@@ -0,0 +1,30 @@
+import unittest
+
+from utils.bench import PhaseStats, compare
+
+
+def baseline_of(samples: dict[str, list[int]]) -> dict:
+    return {"12": {phase: PhaseStats(times).to_dict() for phase, times in samples.items()}}
+
+
+class TestCompare(unittest.TestCase):
+
+    def test_slower_median_and_min(self):
+        baseline = baseline_of({"part1": [100] * 9 + [1000]})
+        regressions = compare({12: {"part1": PhaseStats([150] * 10)}}, baseline, 0.1)
+        self.assertEqual(len(regressions), 1)
+        self.assertIn("part1", regressions[0])
+
+    def test_outlier_is_not_a_regression(self):
+        baseline = baseline_of({"part1": [100] * 10})
+        # A single slow run leaves both the median and the fastest run alone.
+        self.assertEqual(compare({12: {"part1": PhaseStats([100] * 9 + [1000])}}, baseline, 0.1), [])
+
+    def test_framework_phases_are_ignored(self):
+        baseline = baseline_of({"load": [100] * 10, "cache": [100] * 10})
+        current = {12: {"load": PhaseStats([500] * 10), "cache": PhaseStats([500] * 10)}}
+        self.assertEqual(compare(current, baseline, 0.1), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
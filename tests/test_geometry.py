@@ -0,0 +1,45 @@
+import pickle
+import unittest
+
+from utils.puzzles.geometry import BYTEARRAY, Grid, Point
+
+
+class TestGrid(unittest.TestCase):
+
+    def test_typed_storage(self):
+        grid = Grid([1, 2, 3, 4, 5, 6], ncol=3, typecode="b")
+        grid[Point(0, 1)] = 7
+        self.assertEqual(grid[(1, 0)], 7)
+        self.assertEqual([bytes(row) for row in grid.by_row()], [bytes([1, 2, 3]), bytes([7, 5, 6])])
+
+    def test_pickle_round_trip(self):
+        for typecode in (None, "b", "d", BYTEARRAY):
+            grid = Grid([1, 2, 3, 4, 5, 6], ncol=3, typecode=typecode)
+            for protocol in (2, 5):
+                with self.subTest(typecode=typecode, protocol=protocol):
+                    copy = pickle.loads(pickle.dumps(grid, protocol=protocol))
+                    self.assertEqual(copy.typecode, typecode)
+                    self.assertEqual(copy.get_size(), (2, 3))
+                    self.assertEqual(list(copy.values()), [1, 2, 3, 4, 5, 6])
+                    self.assertEqual(copy[Point(2, 1)], 6)
+
+    def test_neighbour_index(self):
+        grid = Grid([0] * 6, ncol=3)
+        # Clockwise from the north, and only within the grid.
+        self.assertEqual(list(grid.neighbour_indices(4)), [1, 5, 3])
+        self.assertEqual(list(grid.neighbour_indices(0, diagonal=True)), [1, 4, 3])
+        # Wrapping around two rows reaches the same cell from both sides, which only counts once.
+        self.assertEqual(list(grid.neighbour_indices(4, wrap=True)), [1, 5, 3])
+        self.assertEqual(list(grid.neighbour_indices(0, wrap=True)), [3, 1, 2])
+        self.assertIs(grid.neighbour_index(), grid.neighbour_index())
+
+    def test_neighbour_index_is_not_pickled(self):
+        grid = Grid([1, 2, 3, 4, 5, 6], ncol=3, typecode="b")
+        grid.neighbour_index()
+        copy = pickle.loads(pickle.dumps(grid))
+        self.assertEqual(copy._neighbours, {})
+        self.assertEqual(list(copy.neighbour_indices(4)), [1, 5, 3])
+
+
+if __name__ == "__main__":
+    unittest.main()
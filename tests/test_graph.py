@@ -0,0 +1,54 @@
+import random
+import unittest
+
+from utils.puzzles import graph
+from utils.puzzles.algorithms import dijkstra_grid
+from utils.puzzles.geometry import Grid
+
+# Cells this high cannot be entered at all.
+WALL = 9
+
+
+def passable(a, b) -> bool:
+    return b != WALL and b - a <= 1
+
+
+class TestGraph(unittest.TestCase):
+
+    def test_parallel_edges_keep_the_shortest(self):
+        g = graph.Graph(["a", "b", "c"], [(0, 1, 5), (0, 1, 2), (1, 2, 1)])
+        self.assertEqual(list(g.edges()), [(0, 1, 2), (1, 2, 1)])
+        self.assertEqual(g.dijkstra([g.node("a")]).distance(g.node("c")), 3)
+
+    def test_contract_corridor(self):
+        # A ring of six nodes with a tail, of which only the ends of the tail are junctions.
+        edges = [(i, (i + 1) % 6, 1) for i in range(6)] + [(0, 6, 4), (6, 7, 1)]
+        edges += [(target, source, weight) for source, target, weight in edges]
+        contracted = graph.Graph(list(range(8)), edges).contract(keep=[3])
+        self.assertEqual(sorted(contracted.labels), [0, 3, 7])
+        distances = contracted.floyd_warshall()
+        self.assertEqual(distances[contracted.node(3)][contracted.node(7)], 8)
+
+    def test_against_dijkstra_grid(self):
+        rng = random.Random(23)
+        for _ in range(300):
+            rows, cols = rng.randint(1, 7), rng.randint(1, 7)
+            grid = Grid([rng.choice((0, 1, 2, 3, WALL)) for _ in range(rows * cols)], ncol=cols, typecode="b")
+            values = grid._values
+            start, end = rng.randrange(rows * cols), rng.randrange(rows * cols)
+            diagonal, wrap = rng.random() < 0.5, rng.random() < 0.5
+
+            def step(a, b):
+                return 1 + values[b] if passable(values[a], values[b]) else None
+
+            with self.subTest(grid=grid.pretty_print(), start=start, end=end, diagonal=diagonal, wrap=wrap):
+                expected = dijkstra_grid(grid, [start], step, diagonal=diagonal, wrap=wrap).distance(end)
+                full = graph.from_grid(grid, passable, lambda a, b: 1 + values[b], diagonal, wrap)
+                self.assertEqual(full.dijkstra([full.node(start)]).distance(full.node(end)), expected)
+                contracted = full.contract(keep=[start, end])
+                distances = contracted.floyd_warshall()
+                self.assertEqual(distances[contracted.node(start)][contracted.node(end)], expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from utils import filehandler
+from utils.puzzles.memo import memoize
+
+
+class TestMemo(unittest.TestCase):
+
+    def setUp(self):
+        # Keep anything remembered on disk out of the real cache.
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        patcher = mock.patch.object(filehandler, "get_cache_dir", return_value=Path(tmp_dir.name))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def make_memo(self, policy: str):
+        calls = []
+
+        @memoize(maxsize=2, policy=policy)
+        def square(x):
+            calls.append(x)
+            return x * x
+        return square, calls
+
+    def test_lru_evicts_least_recently_used(self):
+        square, calls = self.make_memo("lru")
+        for x in (1, 2, 1, 3):
+            square(x)
+        self.assertEqual(calls, [1, 2, 3])
+        # 2 was used least recently, so it had to go to make room for 3.
+        self.assertEqual(square(1), 1)
+        self.assertEqual(square(2), 4)
+        self.assertEqual(calls, [1, 2, 3, 2])
+        self.assertEqual((square.stats.hits, square.stats.misses, square.stats.evictions), (2, 4, 2))
+
+    def test_clock_spares_referenced_results(self):
+        square, calls = self.make_memo("clock")
+        for x in (1, 2, 1, 3):
+            square(x)
+        # The hand passes over 1, which was used since it was stored, and replaces 2 instead.
+        self.assertEqual(square(1), 1)
+        self.assertEqual(calls, [1, 2, 3])
+        self.assertEqual(square(2), 4)
+        self.assertEqual(calls, [1, 2, 3, 2])
+        self.assertEqual(len(square), 2)
+        self.assertEqual(square.stats.evictions, 2)
+
+    def test_method_key_leaves_out_instance(self):
+        class Solver:
+            def __init__(self):
+                # Nothing like this could ever be pickled.
+                self.lock = threading.Lock()
+
+            @memoize(maxsize=10, disk="test_method")
+            def fib(self, n):
+                return n if n < 2 else self.fib(n - 1) + self.fib(n - 2)
+
+        self.assertEqual(Solver().fib(30), 832040)
+        misses = Solver.fib.stats.misses
+        # Another instance gets to use what the first one remembered, in memory or on disk.
+        self.assertEqual(Solver().fib(30), 832040)
+        self.assertEqual(Solver.fib.stats.misses, misses)
+
+    def test_unpicklable_disk_key(self):
+        @memoize(disk="test_unpicklable")
+        def identity(value):
+            return value
+
+        with self.assertRaisesRegex(TypeError, "key hook"):
+            identity(threading.Lock())
+
+
+if __name__ == "__main__":
+    unittest.main()
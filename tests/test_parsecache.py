@@ -0,0 +1,92 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from utils import filehandler, parsecache, runner
+from utils.puzzles.geometry import Grid
+
+
+def with_source(solution, old: str, new: str):
+    """Make the solution believe its module contains changed source code."""
+    source = solution._get_source()
+    assert old.encode("utf-8") in source
+    solution._get_source = lambda: source.replace(old.encode("utf-8"), new.encode("utf-8"))
+    return solution
+
+
+class TestParseCache(unittest.TestCase):
+
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        patcher = mock.patch.object(filehandler, "get_cache_dir", return_value=Path(tmp_dir.name))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_round_trip(self):
+        grid = Grid([1, 2, 3, 4, 5, 6], ncol=3, typecode="b")
+        key = parsecache.make_key("a" * 64, "b" * 64)
+        self.assertEqual(parsecache.load(key), (False, None))
+        self.assertTrue(parsecache.save(key, (grid, [1, 2], "x")))
+        found, data = parsecache.load(key)
+        self.assertTrue(found)
+        self.assertEqual(list(data[0].values()), [1, 2, 3, 4, 5, 6])
+        self.assertEqual(data[1:], ([1, 2], "x"))
+
+    def test_unpicklable_data_is_not_cached(self):
+        key = parsecache.make_key("a" * 64, "b" * 64)
+        self.assertFalse(parsecache.save(key, lambda: None))
+        self.assertEqual(parsecache.load(key), (False, None))
+
+    def test_unreadable_entry_is_discarded(self):
+        key = parsecache.make_key("a" * 64, "b" * 64)
+        parsecache.save(key, [1, 2, 3])
+        path = parsecache.get_parse_cache_dir() / key
+        path.write_bytes(b"garbage")
+        self.assertEqual(parsecache.load(key), (False, None))
+        self.assertFalse(path.exists())
+
+    def test_evict_oldest_but_not_in_flight(self):
+        cache_dir = parsecache.get_parse_cache_dir()
+        for age, name in enumerate(("new", "middle", "old")):
+            parsecache.save(name, bytes(1000))
+            os.utime(cache_dir / name, (1000 - age, 1000 - age))
+        # Another process is still writing this one.
+        (cache_dir / "other.123.tmp").write_bytes(bytes(5000))
+        parsecache.evict(2500)
+        self.assertEqual(sorted(path.name for path in cache_dir.iterdir()), ["middle", "new", "other.123.tmp"])
+
+
+class TestParseSourceHash(unittest.TestCase):
+
+    def setUp(self):
+        self.module = runner.import_solution(2022, 12)
+
+    def test_unrelated_methods_do_not_count(self):
+        before = self.module.Solution()._get_parse_source_hash()
+        changed = with_source(self.module.Solution(), "        return steps[end]", "        return steps[end] + 0")
+        self.assertEqual(changed._get_parse_source_hash(), before)
+        changed = with_source(self.module.Solution(), "            return None\n        return 1",
+                              "            return None\n        return 2")
+        self.assertEqual(changed._get_parse_source_hash(), before)
+
+    def test_parse_counts(self):
+        before = self.module.Solution()._get_parse_source_hash()
+        changed = with_source(self.module.Solution(), 'char = "z"', 'char = "y"')
+        self.assertNotEqual(changed._get_parse_source_hash(), before)
+
+    def test_helpers_called_by_parse_count(self):
+        solution = runner.import_solution(2022, 7).Solution()
+        self.assertIn("_parse_child", solution._find_parse_methods())
+
+    def test_library_counts(self):
+        solution = self.module.Solution()
+        before = solution._get_parse_source_hash()
+        solution._library_hash = "0" * 64
+        self.assertNotEqual(solution._get_parse_source_hash(), before)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,27 @@
+import unittest
+
+from utils.scaling import ScalePoint, fit_exponent, format_report
+
+
+class TestScaling(unittest.TestCase):
+
+    def test_fit_exponent(self):
+        sizes = [10, 100, 1000]
+        self.assertAlmostEqual(fit_exponent(sizes, [3 * s for s in sizes]), 1)
+        self.assertAlmostEqual(fit_exponent(sizes, [s ** 2 for s in sizes]), 2)
+        self.assertAlmostEqual(fit_exponent(sizes, [5, 5, 5]), 0)
+
+    def test_fit_exponent_needs_two_sizes(self):
+        self.assertIsNone(fit_exponent([10], [100]))
+        self.assertIsNone(fit_exponent([10, 10], [100, 200]))
+        # Zero timings cannot be put on a log scale, and are left out.
+        self.assertIsNone(fit_exponent([10, 100], [0, 200]))
+
+    def test_format_report(self):
+        points = [ScalePoint(1, 100, {"parse": 1000, "part1": 10_000}), ScalePoint(10, 1000, {"parse": 10_000})]
+        lines = format_report(points).splitlines()
+        self.assertEqual(lines[-2].split(), ["growth", "|", "|", "n^1.00", "|", "?"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from utils import misc
+from utils.snapshots import SnapshotStore
+
+
+class TestSnapshotStore(unittest.TestCase):
+
+    def setUp(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.dir = Path(tmp_dir.name)
+
+    def open_store(self, **kwargs) -> SnapshotStore:
+        store = SnapshotStore(self.dir / "snapshots.db", **kwargs)
+        self.addCleanup(store.close)
+        return store
+
+    def count(self, store: SnapshotStore, key: str) -> int:
+        return store._db.execute("SELECT COUNT(*) FROM snapshots WHERE key = ?", (key,)).fetchone()[0]
+
+    def test_keeps_at_most_max_count(self):
+        store = self.open_store(max_count=3)
+        now = misc.unix_now()
+        for i in range(5):
+            store.save("board", f"data {i}", now - 10 + i)
+        self.assertEqual(self.count(store, "board"), 3)
+        self.assertEqual(store.latest("board"), ("data 4", now - 6))
+
+    def test_drops_old_snapshots_but_never_the_latest(self):
+        store = self.open_store(max_age=100)
+        now = misc.unix_now()
+        store.save("board", "ancient", now - 1000)
+        store.save("board", "older", now - 500)
+        self.assertEqual(self.count(store, "board"), 1)
+        self.assertEqual(store.latest("board"), ("older", now - 500))
+        store.save("board", "recent", now)
+        self.assertEqual(self.count(store, "board"), 1)
+
+    def test_unchanged_data_only_moves_timestamp(self):
+        store = self.open_store()
+        now = misc.unix_now()
+        store.save("board", "same", now - 10)
+        store.save("board", "same", now)
+        self.assertEqual(self.count(store, "board"), 1)
+        self.assertEqual(store.latest("board"), ("same", now))
+
+    def test_older_snapshot_does_not_become_latest(self):
+        store = self.open_store()
+        now = misc.unix_now()
+        store.save("board", "new", now)
+        store.save("board", "late arrival", now - 10)
+        self.assertEqual(store.latest("board"), ("new", now))
+        self.assertEqual(self.count(store, "board"), 2)
+
+    def test_imports_legacy_files(self):
+        now = misc.unix_now()
+        (self.dir / f"2022_leaderboard_private_view_1-{now - 5}").write_text("first", encoding="utf-8")
+        (self.dir / f"2022_leaderboard_private_view_1-{now}").write_text("second", encoding="utf-8")
+        store = self.open_store()
+        self.assertEqual(store.latest("2022_leaderboard_private_view_1"), ("second", now))
+        self.assertEqual([path.name for path in self.dir.iterdir()], ["snapshots.db"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+import os
+import time
+import unittest
+
+from utils import supervisor
+
+# Filled in by set_progress in the child process, which has a copy of its own.
+_progress = []
+
+
+def _spin():
+    done = 0
+    while True:
+        done += 1
+        _progress[0](done)
+        time.sleep(0.001)
+
+
+def _hog_memory():
+    hog = []
+    while True:
+        hog.append(bytearray(2**20))
+        time.sleep(0.001)
+
+
+def _fail():
+    raise KeyError("missing")
+
+
+@unittest.skipUnless(supervisor.can_supervise(), "supervising needs fork")
+class TestSupervisor(unittest.TestCase):
+
+    def test_returns_result(self):
+        self.assertEqual(supervisor.run_supervised("sum", sum, ([1, 2, 3],), time_budget=5), 6)
+
+    def test_passes_on_errors(self):
+        with self.assertRaises(KeyError):
+            supervisor.run_supervised("fail", _fail, (), time_budget=5)
+
+    def test_kills_on_time_budget(self):
+        start = time.perf_counter()
+        with self.assertRaises(supervisor.BudgetExceeded) as context:
+            supervisor.run_supervised("2022 Day 99 part1", _spin, (), time_budget=0.3,
+                                      set_progress=_progress.append)
+        self.assertLess(time.perf_counter() - start, 2)
+        e = context.exception
+        self.assertEqual(e.reason, "time")
+        self.assertGreater(e.last_progress[0], 0)
+        self.assertRegex(str(e), r"^2022 Day 99 part1 exceeded its time budget and was killed \(after [\d.]+s, "
+                                 r"last progress \d+ at [\d.]+s\)$")
+
+    @unittest.skipIf(supervisor.get_rss(os.getpid()) is None, "memory cannot be measured here")
+    def test_kills_on_memory_budget(self):
+        with self.assertRaises(supervisor.BudgetExceeded) as context:
+            supervisor.run_supervised("hog", _hog_memory, (), time_budget=10, memory_budget=200 * 2**20)
+        self.assertEqual(context.exception.reason, "memory")
+        self.assertGreater(context.exception.peak_rss, 200 * 2**20)
+        self.assertIn("no progress reported", str(context.exception))
+
+
+if __name__ == "__main__":
+    unittest.main()
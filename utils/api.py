@@ -1,30 +1,82 @@
 # Anything that needs or tries to interact with the AdventOfCode webpage goes here.
 import logging
-
-import requests
+import time
+from typing import Iterator
 
 from utils import constants
+from utils.lazy import lazy_import
+
+# Only needed once something actually has to be downloaded.
+futures = lazy_import("concurrent.futures")
+requests = lazy_import("requests")
+threading = lazy_import("threading")
 
 
 class APIHandler:
 
-    def __init__(self, session_cookie: str):
+    def __init__(self, session_cookie: str, base_url: str = constants.AOC_URL, max_connections: int = 4,
+                 min_interval: float = constants.REQUEST_INTERVAL):
         self.session_cookie = session_cookie
+        self.base_url = base_url.rstrip("/")
+        self.max_connections = max_connections
+        self.min_interval = min_interval
         self._log = logging.getLogger(constants.ROOT_LOGGER + "." + __name__)
+        self._session = None
+        self._session_lock = threading.Lock()
+        self._rate_lock = threading.Lock()
+        self._next_request = 0.0
 
     def get_leaderboard(self, year: int) -> str:
-        url = constants.LEADERBOARD_URL.format(year, constants.USER_ID)
+        url = self._url(constants.LEADERBOARD_URL, year, constants.USER_ID)
         self._log.info(f"Requesting leaderboard stats from {url}")
         return self._request_response(url)
 
     def get_puzzle_input(self, year: int, day: int) -> str:
-        url = constants.INPUT_URL.format(year, day)
+        url = self._url(constants.INPUT_URL, year, day)
         self._log.info(f"Requesting puzzle input from {url}")
         return self._request_response(url)
 
+    def get_puzzle_inputs(self, year: int, days: list[int]) -> Iterator[tuple[int, str | Exception]]:
+        """Download the puzzle input for several days concurrently. Yields each day's input as soon as it arrives,
+        or the exception that kept it from arriving."""
+        with futures.ThreadPoolExecutor(max_workers=self.max_connections) as pool:
+            pending = {pool.submit(self.get_puzzle_input, year, day): day for day in days}
+            for future in futures.as_completed(pending):
+                try:
+                    yield pending[future], future.result()
+                except Exception as e:
+                    yield pending[future], e
+
+    def _get_session(self):
+        """Get the session shared by all requests, so that connections to the server are reused."""
+        with self._session_lock:
+            if self._session is None:
+                session = requests.Session()
+                adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=self.max_connections)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                session.cookies.set("session", self.session_cookie)
+                session.headers["User-Agent"] = constants.USER_AGENT
+                self._session = session
+        return self._session
+
     def _request_response(self, url: str) -> str:
-        response = requests.get(url, cookies={"session": self.session_cookie})
+        self._wait_for_turn()
+        response = self._get_session().get(url)
         if response.status_code == 200:
             return response.text
         self._log.fatal(f"Unexpected response from server: {response.status_code} {response.reason}")
         raise ConnectionError(f"Bad response from AoC: {response.status_code} {response.reason}")
+
+    def _url(self, template: str, *args) -> str:
+        """Fill in a URL template and point it at the configured server."""
+        return template.format(*args).replace(constants.AOC_URL, self.base_url, 1)
+
+    def _wait_for_turn(self):
+        """Block until enough time has passed since the last request to be polite to the server."""
+        with self._rate_lock:
+            now = time.monotonic()
+            wait = self._next_request - now
+            self._next_request = max(now, self._next_request) + self.min_interval
+        if wait > 0:
+            time.sleep(wait)
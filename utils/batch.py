@@ -0,0 +1,90 @@
+# Anything to do with solving one day for many different input files at once goes here.
+import glob
+import json
+import logging
+import os
+import sys
+import time
+from concurrent import futures
+from pathlib import Path
+
+from utils import constants, runner
+
+_log = logging.getLogger(constants.ROOT_LOGGER + "." + __name__)
+# The solution module of the day a worker process solves, imported once when the worker starts.
+_worker_module = None
+
+
+def _init_worker(year: int, day: int):
+    """Worker process initialiser. Imports the solution once and silences its output for good."""
+    global _worker_module
+    logging.getLogger(constants.ROOT_LOGGER).setLevel(logging.WARNING)
+    sys.stdout = open(os.devnull, "w")
+    _worker_module = runner.import_solution(year, day)
+
+
+def _solve_file(path: str) -> dict:
+    """Worker process entry point. Solves a single input file and returns the record for it."""
+    start = time.perf_counter()
+    try:
+        result = _worker_module.Solution().solve(False, path=Path(path))
+    except Exception as e:
+        return {"input": path, "error": f"{type(e).__name__}: {e}", "seconds": time.perf_counter() - start}
+    return {"input": path, **result.to_dict(), "error": None, "seconds": time.perf_counter() - start}
+
+
+def find_inputs(pattern: str) -> list[str]:
+    """Get the absolute paths of all files matching the glob pattern, in a stable order."""
+    return sorted({os.path.abspath(path) for path in glob.glob(pattern, recursive=True) if os.path.isfile(path)})
+
+
+def load_done(output: Path) -> set[str]:
+    """Get the inputs which already have a successful record in the output file."""
+    done = set()
+    if not output.exists():
+        return done
+    with open(output, "r", encoding="utf-8") as file:
+        for line in file:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # Most likely the last line of a batch which was cut short.
+                continue
+            if record.get("error") is None and "input" in record:
+                done.add(record["input"])
+    return done
+
+
+def solve_batch(year: int, day: int, pattern: str, output: Path, jobs: int = None) -> tuple[int, int]:
+    """Solve every input file matching the pattern on a pool of workers, and append a JSON line per file to the
+    output as soon as it is done. Inputs which were already solved successfully are skipped.
+
+    Returns the number of inputs that were solved and that failed.
+    """
+    inputs = find_inputs(pattern)
+    done = load_done(output)
+    todo = [path for path in inputs if path not in done]
+    _log.info(f"Found {len(inputs)} inputs matching '{pattern}', {len(inputs) - len(todo)} of them already solved")
+    if not todo:
+        return 0, 0
+
+    jobs = min(jobs or os.cpu_count() or 1, len(todo))
+    _log.info(f"Solving {len(todo)} inputs for AoC {year} Day {day} on {jobs} processes")
+    solved = failed = 0
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "a", encoding="utf-8") as file, \
+            futures.ProcessPoolExecutor(jobs, initializer=_init_worker, initargs=(year, day)) as pool:
+        pending = [pool.submit(_solve_file, path) for path in todo]
+        for future in futures.as_completed(pending):
+            record = future.result()
+            file.write(json.dumps(record, default=str) + "\n")
+            # Make sure that every finished input survives if the batch gets interrupted.
+            file.flush()
+            if record["error"] is None:
+                solved += 1
+            else:
+                failed += 1
+                _log.warning(f"{record['input']} failed: {record['error']}")
+            _log.debug(f"[{solved + failed}/{len(todo)}] {record['input']}")
+
+    return solved, failed
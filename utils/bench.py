@@ -0,0 +1,112 @@
+# Anything to do with benchmarking solutions and catching performance regressions goes here.
+import json
+import logging
+import math
+import statistics
+from pathlib import Path
+
+from utils import constants, filehandler, misc, runner
+
+_log = logging.getLogger(constants.ROOT_LOGGER + "." + __name__)
+# Only the solution's own phases are checked for regressions. The rest is down to the framework and the disk.
+COMPARED_PHASES = ("parse", "part1", "part2")
+
+
+class PhaseStats:
+    """Summary statistics over repeated timings of a single phase, all in nanoseconds."""
+
+    def __init__(self, samples: list[int]):
+        if not samples:
+            raise ValueError("Statistics need at least one sample!")
+        ordered = sorted(samples)
+        self.runs = len(ordered)
+        self.min = ordered[0]
+        self.median = statistics.median(ordered)
+        # Nearest-rank percentile, which never interpolates between samples.
+        self.p95 = ordered[max(0, math.ceil(0.95 * len(ordered)) - 1)]
+        self.stdev = statistics.stdev(ordered) if len(ordered) > 1 else 0.0
+
+    @property
+    def cv(self) -> float:
+        """The coefficient of variation, i.e. how noisy the runs were relative to their median."""
+        return self.stdev / self.median if self.median else 0.0
+
+    def to_dict(self) -> dict:
+        return {"runs": self.runs, "min": self.min, "median": self.median, "p95": self.p95, "stdev": self.stdev}
+
+
+def bench_day(year: int, day: int, test_input: bool, repeats: int = 10, warmup: int = 2) -> dict[str, PhaseStats]:
+    """Solve the puzzle for a day repeatedly and gather statistics for each phase."""
+    if repeats < 1:
+        raise ValueError("At least one measured run is needed to benchmark anything!")
+    module = runner.import_solution(year, day)
+    samples = {}
+    _log.info(f"Benchmarking {year} Day {day}: {warmup} warm-up runs, {repeats} measured runs")
+    with runner.quiet_output():
+        for _ in range(warmup):
+            module.Solution().solve(test_input)
+        for _ in range(repeats):
+            result = module.Solution().solve(test_input)
+            for phase, ns in result.timings_ns.items():
+                samples.setdefault(phase, []).append(ns)
+
+    # A phase which never ran, e.g. because its answer was stored, has nothing to summarise.
+    return {phase: PhaseStats(times) for phase, times in samples.items() if times}
+
+
+def compare(stats: dict[int, dict[str, PhaseStats]], baseline: dict, threshold: float) -> list[str]:
+    """Get a description of every phase of the solution itself which got slower than the baseline by more than the
+    threshold. Both the median and the fastest run must have slowed down, each compared to its own counterpart in the
+    baseline, so that a single noisy run on either side never passes for a regression."""
+    regressions = []
+    for day, phases in stats.items():
+        old_phases = baseline.get(str(day), {})
+        for phase in COMPARED_PHASES:
+            current, old = phases.get(phase), old_phases.get(phase)
+            if current is None or old is None or old["median"] <= 0 or old["min"] <= 0:
+                continue
+            change = current.median / old["median"] - 1
+            min_change = current.min / old["min"] - 1
+            if change > threshold and min_change > threshold:
+                regressions.append(f"Day {day:02} {phase}: {old['median'] / 1e6:.3f}ms -> "
+                                   f"{current.median / 1e6:.3f}ms (+{change:.0%}, fastest run +{min_change:.0%})")
+
+    return regressions
+
+
+def format_stats(stats: dict[int, dict[str, PhaseStats]]) -> str:
+    """Get a printable table of the benchmark statistics for every day and phase, in milliseconds."""
+    rows = [("Day", "Phase", "min", "median", "p95", "stdev", "cv")]
+    for day, phases in stats.items():
+        for phase, s in phases.items():
+            rows.append((f"{day:02}", phase, f"{s.min / 1e6:.3f}", f"{s.median / 1e6:.3f}", f"{s.p95 / 1e6:.3f}",
+                         f"{s.stdev / 1e6:.3f}", f"{s.cv:.1%}"))
+
+    return "\n".join(misc.format_table(rows)) + "\n(all timings in ms)"
+
+
+def get_baseline_file(year: int, test_input: bool) -> Path:
+    suffix = "-test" if test_input else ""
+    return filehandler.get_cache_dir() / f"bench-{year}{suffix}.json"
+
+
+def load_baseline(year: int, test_input: bool) -> dict:
+    path = get_baseline_file(year, test_input)
+    if not path.exists():
+        _log.warning(f"No benchmark baseline exists at {path}")
+        return {}
+    with open(path, "r", encoding="utf-8") as file:
+        return json.load(file)
+
+
+def save_baseline(stats: dict[int, dict[str, PhaseStats]], year: int, test_input: bool):
+    """Store the benchmark results as the new baseline, keeping the baseline of any days which were not run."""
+    baseline = load_baseline(year, test_input) if get_baseline_file(year, test_input).exists() else {}
+    for day, phases in stats.items():
+        baseline[str(day)] = {phase: s.to_dict() for phase, s in phases.items()}
+
+    path = get_baseline_file(year, test_input)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(baseline, file, indent=2)
+    _log.info(f"Saved benchmark baseline to {path}")
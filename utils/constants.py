@@ -1,13 +1,33 @@
 ROOT_LOGGER = "aoc"
 
 # API and Requests
+AOC_URL = "https://adventofcode.com"
 CACHE_DIR = ".cache"
-DAY_URL = "https://adventofcode.com/{}/day/{}"
-INPUT_URL = "https://adventofcode.com/{}/day/{}/input"
-LEADERBOARD_URL = "https://adventofcode.com/{}/leaderboard/private/view/{}.json"
+DAY_URL = AOC_URL + "/{}/day/{}"
+INPUT_URL = AOC_URL + "/{}/day/{}/input"
+LEADERBOARD_URL = AOC_URL + "/{}/leaderboard/private/view/{}.json"
 REFRESH_RATE = 3600
+# Snapshots of the leaderboard. Older ones are dropped once there are more than the maximum count or they are older
+# than the maximum age in seconds, but the latest one is always kept.
+SNAPSHOT_DB_FILENAME = "snapshots.db"
+SNAPSHOT_MAX_AGE = 30 * 24 * 3600
+SNAPSHOT_MAX_COUNT = 50
+# Minimum number of seconds between the start of any two requests.
+REQUEST_INTERVAL = 0.5
+USER_AGENT = "github.com/tinyhoot/AdventOfCode"
+
+# Profiling
+PROFILE_DIR = "profiles"
+
+# Caching of parsed puzzle input
+PARSE_CACHE_DIR = "parsed"
+PARSE_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+# Memoised results which are kept on disk
+MEMO_CACHE_DIR = "memo"
 
 # Puzzles and unlock timings
+LAST_DAY = 25
 UNLOCK_OFFSET = 6
 
 # User data
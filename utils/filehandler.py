@@ -1,21 +1,50 @@
 # Anything to do with file handling inside the project directory goes here.
+import hashlib
 import logging
+import mmap
 import os
 import shutil
+from contextlib import contextmanager
 from pathlib import Path
-import re
+from typing import Iterator
 
 from utils import constants, misc
 from utils.api import APIHandler
 from utils.errors import ImpatientError
+from utils.lazy import lazy_import
+
+json = lazy_import("json")
 
 PUZZLE_INPUT_FILENAME = "puzzle_input.txt"
 SOLUTION_FILENAME = "solution.py"
 TEST_INPUT_FILENAME = "test_input.txt"
 SESSION_COOKIE_FILENAME = "session_cookie"
+ANSWER_DIRNAME = "answers"
 _log = logging.getLogger(constants.ROOT_LOGGER + "." + __name__)
 
 
+def fetch_puzzle_inputs(year: int, max_connections: int = 4, base_url: str = constants.AOC_URL) -> list[int]:
+    """Download the puzzle input for every day which has already unlocked but is still missing one.
+    Returns the days which were downloaded successfully."""
+    days = [day for day in range(1, constants.LAST_DAY + 1)
+            if misc.is_unlocked(year, day) and not (get_day_dir(year, day) / PUZZLE_INPUT_FILENAME).exists()]
+    if not days:
+        _log.info(f"All unlocked puzzle inputs for {year} already exist.")
+        return []
+
+    _log.info(f"Fetching puzzle input for {year} Days {', '.join(map(str, days))}")
+    api_handler = APIHandler(get_session_cookie(), base_url, max_connections)
+    fetched = []
+    for day, data in api_handler.get_puzzle_inputs(year, days):
+        if isinstance(data, Exception):
+            _log.error(f"Failed to fetch puzzle input for {year}-{day}: {data}")
+            continue
+        save_puzzle_input(data, year, day)
+        fetched.append(day)
+
+    return sorted(fetched)
+
+
 def get_base_dir() -> Path:
     """Get the project base directory."""
     # Hardcoded and relies on a specific file structure, but that's fine.
@@ -34,41 +63,48 @@ def get_day_dir(year: int, day: int) -> Path:
     return get_base_dir() / year_str / day_str
 
 
-def get_latest_day(year: int) -> int:
-    """Get the latest day that exists for the given year."""
+def get_days(year: int) -> list[int]:
+    """Get all days that have a solution for the given year, in ascending order."""
     year_dir = get_base_dir() / str(year)
-    latest = -1
+    days = []
     for child in year_dir.iterdir():
-        if child.is_dir():
+        if child.is_dir() and (child / SOLUTION_FILENAME).exists():
             try:
-                day = int(child.name)
-                latest = day if day > latest else latest
+                days.append(int(child.name))
             except ValueError:
                 continue
 
-    if latest == -1:
+    return sorted(days)
+
+
+def get_latest_day(year: int) -> int:
+    """Get the latest day that exists for the given year."""
+    days = get_days(year)
+    if not days:
         raise FileNotFoundError(f"No day directories exist for year {year}!")
-    return latest
+    return days[-1]
 
 
 def get_puzzle_input(year: int, day: int) -> str:
     """Get the puzzle input for a specific day. Download it if it does not already exist."""
+    return read_input(get_puzzle_input_file(year, day))
+
+
+def get_puzzle_input_file(year: int, day: int) -> Path:
+    """Get the path to the puzzle input for a specific day. Download it if it does not already exist."""
     if not misc.is_unlocked(year, day):
         raise ImpatientError(f"Be patient! The puzzle for {year}-12-{day} unlocks at 5am UTC.")
 
     puzzle_file = get_day_dir(year, day) / PUZZLE_INPUT_FILENAME
     _log.info(f"Grabbing puzzle input from file: {puzzle_file}")
 
-    if puzzle_file.exists():
-        with open(puzzle_file, "r", encoding="utf-8") as file:
-            data = file.read()
-    else:
+    if not puzzle_file.exists():
         _log.warning(f"No puzzle file found for {year}-{day}, downloading.")
         api_handler = APIHandler(get_session_cookie())
         data = api_handler.get_puzzle_input(year, day)
         save_puzzle_input(data, year, day)
 
-    return data
+    return puzzle_file
 
 
 def get_solution(year: int, day: int) -> Path:
@@ -82,14 +118,16 @@ def get_solution_template() -> Path:
 
 def get_test_input(year: int, day: int) -> str:
     """Get the testing input for a specific day."""
+    return read_input(get_test_input_file(year, day))
+
+
+def get_test_input_file(year: int, day: int) -> Path:
+    """Get the path to the testing input for a specific day."""
     test_file = get_day_dir(year, day) / TEST_INPUT_FILENAME
     _log.info(f"Grabbing test input from file: {test_file}")
-    if test_file.exists():
-        with open(test_file, "r", encoding="utf-8") as file:
-            data = file.read()
-        return data
-    else:
+    if not test_file.exists():
         raise FileNotFoundError(f"Failed to find test input file at {test_file}")
+    return test_file
 
 
 def get_session_cookie() -> str:
@@ -109,30 +147,104 @@ def _get_session_cookie_file() -> Path:
     return cookie_file
 
 
-def load_cache(url: str) -> tuple[str, int] | tuple[None, None]:
-    path = _url_to_filename(url)
-    cached_files = sorted(path.parent.glob(f"{path.name}-*"), reverse=True, key=lambda x: int(x.name.split("-")[1]))
-    if not cached_files:
-        _log.info(f"Found no cache for {path}")
-        return None, None
+def _get_answer_file(year: int, day: int) -> Path:
+    return get_cache_dir() / ANSWER_DIRNAME / f"{year}-{day:02}.json"
 
-    # Load only the latest file.
-    with open(cached_files[0], "r", encoding="utf-8") as file:
-        data = file.read()
-    timestamp = int(cached_files[0].name.split("-")[1])
-    return data, timestamp
 
+def hash_file(path: Path) -> str:
+    """Get a hash which uniquely identifies the contents of a file, without reading it all at once."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        # hashlib.file_digest would do the same, but only exists from Python 3.11 onwards.
+        while chunk := file.read(1 << 20):
+            digest.update(chunk)
+    return digest.hexdigest()
 
-def save_cache(data, url: str):
-    path = _url_to_filename(url)
-    # Add a timestamp.
-    timestamp = int(misc.unix_now())
-    path = path.with_name(f"{path.name}-{timestamp}")
 
-    get_cache_dir().mkdir(parents=True, exist_ok=True)
-    with open(path, "w", encoding="utf-8") as file:
-        file.write(data)
-        _log.info(f"Wrote cache to disk at {path.name}")
+def hash_input(raw: str) -> str:
+    """Get a hash which uniquely identifies a puzzle input."""
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def iter_lines(path: Path) -> Iterator[str]:
+    """Lazily yield the lines of a file one by one, without their line endings."""
+    with open(path, "r", encoding="utf-8", buffering=1024 * 1024) as file:
+        for line in file:
+            yield line.rstrip("\n")
+
+
+def _load_answers(year: int, day: int) -> dict:
+    path = _get_answer_file(year, day)
+    if not path.exists():
+        return {}
+    with open(path, "r", encoding="utf-8") as file:
+        return json.load(file)
+
+
+def _write_answers(answers: dict, year: int, day: int):
+    path = _get_answer_file(year, day)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Write to a temporary file first so that concurrent runs never see a half-written store.
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as file:
+        json.dump(answers, file, indent=2)
+    os.replace(tmp_path, path)
+
+
+def load_answer(year: int, day: int, part: int, input_hash: str, source_hash: str) -> dict | None:
+    """Get the stored answer and its timing metadata for a part, if the solution has not changed since."""
+    answers = _load_answers(year, day)
+    entry = answers.get(str(part), {}).get(input_hash)
+    if entry is None:
+        return None
+    if entry["source"] != source_hash:
+        _log.info(f"Solution for {year}-{day} part {part} changed, dropping its stored answers")
+        answers[str(part)] = {k: v for k, v in answers[str(part)].items() if v["source"] == source_hash}
+        _write_answers(answers, year, day)
+        return None
+    return entry
+
+
+@contextmanager
+def map_bytes(path: Path) -> Iterator[memoryview]:
+    """Memory-map a file and provide read-only access to its raw bytes without copying them."""
+    with open(path, "rb") as file:
+        # Empty files cannot be mapped, but there is nothing to read from them anyway.
+        if os.fstat(file.fileno()).st_size == 0:
+            yield memoryview(b"")
+            return
+        mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    view = memoryview(mapped)
+    try:
+        yield view
+    finally:
+        view.release()
+        try:
+            mapped.close()
+        except BufferError:
+            # Something still holds on to a slice of the file. It gets unmapped once that is garbage collected.
+            _log.debug(f"Could not unmap {path} yet, views into it are still in use")
+
+
+def read_input(path: Path) -> str:
+    """Read an entire puzzle input file at once."""
+    with open(path, "r", encoding="utf-8") as file:
+        return file.read()
+
+
+def save_answer(year: int, day: int, part: int, input_hash: str, source_hash: str, answer, elapsed_ns: int):
+    """Store the answer to a part along with how long it took to compute."""
+    answers = _load_answers(year, day)
+    # Answers from any older version of the solution are stale now, whatever input they were for.
+    entries = {k: v for k, v in answers.get(str(part), {}).items() if v["source"] == source_hash}
+    entries[input_hash] = {
+        "source": source_hash,
+        "answer": answer,
+        "elapsed_ns": elapsed_ns,
+        "timestamp": misc.unix_now(),
+    }
+    answers[str(part)] = entries
+    _write_answers(answers, year, day)
 
 
 def save_puzzle_input(data, year: int, day: int):
@@ -140,24 +252,22 @@ def save_puzzle_input(data, year: int, day: int):
     file_path = dir_path / PUZZLE_INPUT_FILENAME
 
     dir_path.mkdir(parents=True, exist_ok=True)
-    with open(file_path, "w", encoding="utf-8") as file:
+    # Write to a temporary file first so that an interrupted download never leaves a partial input behind.
+    tmp_path = file_path.with_name(f"{file_path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as file:
         file.write(data)
+    os.replace(tmp_path, file_path)
     _log.info(f"Saved puzzle input to disk for {year}-{day}")
 
 
 def setup_day(year: int, day: int):
     """Set up all the template files for the specific day and year."""
     day_dir = get_day_dir(year, day)
-    if day_dir.exists():
-        raise ValueError(f"The directory for {year} Day {day} already exists!")
-    day_dir.mkdir(parents=True)
+    # The directory may already exist if its puzzle input was fetched ahead of time.
+    if get_solution(year, day).exists():
+        raise ValueError(f"The solution for {year} Day {day} already exists!")
+    day_dir.mkdir(parents=True, exist_ok=True)
     test_input = day_dir / TEST_INPUT_FILENAME
     test_input.touch()
     shutil.copy2(get_solution_template(), get_solution(year, day))
 
-
-def _url_to_filename(url: str) -> Path:
-    # Drop the domain and filename, replace slashes.
-    filename = re.search(".com/(.*).json", url)[1]
-    filename = re.sub("/", "_", filename)
-    return get_cache_dir() / filename
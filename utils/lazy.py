@@ -0,0 +1,37 @@
+# Deferring the import of modules which are slow to load until they are actually needed.
+import importlib.util
+import sys
+from types import ModuleType
+
+
+class _MissingModule(ModuleType):
+    """Stands in for a module which is not installed, and only complains about it once it is actually used."""
+
+    def __getattr__(self, attr: str):
+        raise ModuleNotFoundError(f"No module named '{self.__name__}'", name=self.__name__)
+
+
+def lazy_import(name: str) -> ModuleType:
+    """Get a module which only actually gets loaded once one of its attributes is first accessed. If the module is not
+    installed, that first access raises ModuleNotFoundError instead, so that only code which uses it depends on it."""
+    if name in sys.modules:
+        return sys.modules[name]
+
+    try:
+        spec = importlib.util.find_spec(name)
+    except ModuleNotFoundError:
+        # The parent package of the module is missing.
+        spec = None
+    if spec is None:
+        return _MissingModule(name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    parent, _, child = name.rpartition(".")
+    if parent:
+        # A regular import makes submodules attributes of their package, and code which imports the package again will
+        # expect to find them there.
+        setattr(sys.modules[parent], child, module)
+    return module
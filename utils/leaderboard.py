@@ -1,9 +1,12 @@
-import json
 import logging
 import re
 
 from utils import constants, filehandler, misc
 from utils.api import APIHandler
+from utils.lazy import lazy_import
+from utils.snapshots import SnapshotStore, url_to_key
+
+json = lazy_import("json")
 
 
 README_STAR = "\u2728"
@@ -18,16 +21,18 @@ class Leaderboard:
     def _get_leaderboard(self) -> dict:
         """Get the leaderboard JSON data from cache or online."""
         url = constants.LEADERBOARD_URL.format(self.year, constants.USER_ID)
-        cache, timestamp = filehandler.load_cache(url)
-
-        # If the cache is missing or old, redownload.
-        if cache and misc.unix_now() - timestamp <= constants.REFRESH_RATE:
-            data = cache
-        else:
-            self._log.info("Cache was old or missing, redownloading.")
-            api_handler = APIHandler(filehandler.get_session_cookie())
-            data = api_handler.get_leaderboard(self.year)
-            filehandler.save_cache(data, url)
+        key = url_to_key(url)
+        with SnapshotStore() as store:
+            cache, timestamp = store.latest(key)
+
+            # If the cache is missing or old, redownload.
+            if cache and misc.unix_now() - timestamp <= constants.REFRESH_RATE:
+                data = cache
+            else:
+                self._log.info("Cache was old or missing, redownloading.")
+                api_handler = APIHandler(filehandler.get_session_cookie())
+                data = api_handler.get_leaderboard(self.year)
+                store.save(key, data)
 
         return json.loads(data)
 
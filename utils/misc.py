@@ -9,6 +9,34 @@ def is_unlocked(year: int, day: int) -> bool:
     return unix_unlock_time(year, day) - unix_now() < 0
 
 
+def format_table(rows: list[tuple[str, ...]], align: str = ">") -> list[str]:
+    """Lay out rows of cells as the lines of a table, with a separator below the header row. Every column is aligned
+    the same way, or each one as given, e.g. '>><' for two right-aligned columns followed by a left-aligned one."""
+    widths = [max(len(row[col]) for row in rows) for col in range(len(rows[0]))]
+    aligns = align * len(widths) if len(align) == 1 else align
+    lines = [" | ".join(f"{cell:{a}{width}}" for cell, a, width in zip(row, aligns, widths)).rstrip() for row in rows]
+    lines.insert(1, "-+-".join("-" * width for width in widths))
+    return lines
+
+
+def parse_day_range(spec: str) -> list[int]:
+    """Turn a string of days like '3-9,12' into a sorted list of unique days."""
+    days = set()
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            start, end = map(int, part.split("-", 1))
+            if start > end:
+                raise ValueError(f"Invalid day range '{part}', start must not be after end!")
+            days.update(range(start, end + 1))
+        else:
+            days.add(int(part))
+
+    return sorted(days)
+
+
 def ts_to_hours(timestamp: int, other_time: int) -> str:
     """Take two timestamps and convert their time difference to a string hh:mm:ss"""
     d1 = datetime.fromtimestamp(timestamp)
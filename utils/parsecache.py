@@ -0,0 +1,115 @@
+# A content-addressed cache for parsed puzzle input, so that unchanged input does not have to be parsed again.
+import hashlib
+import logging
+import os
+import pickle
+import struct
+from pathlib import Path
+
+from utils import constants, filehandler
+
+_HEADER = struct.Struct("<4sI")
+_LENGTH = struct.Struct("<Q")
+_MAGIC = b"AOCP"
+_log = logging.getLogger(constants.ROOT_LOGGER + "." + __name__)
+
+
+def get_parse_cache_dir() -> Path:
+    return filehandler.get_cache_dir() / constants.PARSE_CACHE_DIR
+
+
+def make_key(input_hash: str, source_hash: str) -> str:
+    """Get the cache key for the input with the given hash, parsed by code with the given source hash."""
+    return input_hash[:32] + "-" + hashlib.sha256(source_hash.encode("utf-8")).hexdigest()[:32]
+
+
+def load(key: str) -> tuple[bool, object]:
+    """Try to load parsed data from the cache. Returns whether it was found, and the data if so."""
+    path = get_parse_cache_dir() / key
+    try:
+        with open(path, "rb") as file:
+            contents = memoryview(file.read())
+    except FileNotFoundError:
+        return False, None
+
+    try:
+        magic, num_buffers = _HEADER.unpack_from(contents)
+        if magic != _MAGIC:
+            raise ValueError(f"Not a parse cache file: {path}")
+        offset = _HEADER.size
+        lengths = []
+        for _ in range(num_buffers + 1):
+            lengths.append(_LENGTH.unpack_from(contents, offset)[0])
+            offset += _LENGTH.size
+        # The pickle itself comes first, followed by any out-of-band buffers.
+        chunks = []
+        for length in lengths:
+            chunks.append(contents[offset:offset + length])
+            offset += length
+        data = pickle.loads(chunks[0], buffers=chunks[1:])
+    except Exception as e:
+        _log.warning(f"Discarding unreadable parse cache entry {key}: {type(e).__name__}: {e}")
+        path.unlink(missing_ok=True)
+        return False, None
+
+    # Keep track of when an entry was last used so that eviction removes the stale ones first.
+    try:
+        os.utime(path)
+    except FileNotFoundError:
+        # Evicted by another process in the meantime, which makes no difference to the data already loaded.
+        pass
+    return True, data
+
+
+def save(key: str, data) -> bool:
+    """Store parsed data in the cache. Returns False if the data could not be pickled."""
+    buffers = []
+    try:
+        payload = pickle.dumps(data, protocol=5, buffer_callback=buffers.append)
+    except (pickle.PicklingError, TypeError, AttributeError) as e:
+        _log.debug(f"Parsed data cannot be cached: {type(e).__name__}: {e}")
+        return False
+
+    raw_buffers = [buffer.raw() for buffer in buffers]
+    cache_dir = get_parse_cache_dir()
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    path = cache_dir / key
+    # Any other process writing the same entry at the same time must not get in the way.
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "wb") as file:
+        file.write(_HEADER.pack(_MAGIC, len(raw_buffers)))
+        file.write(_LENGTH.pack(len(payload)))
+        for buffer in raw_buffers:
+            file.write(_LENGTH.pack(buffer.nbytes))
+        file.write(payload)
+        for buffer in raw_buffers:
+            file.write(buffer)
+    os.replace(tmp_path, path)
+    _log.debug(f"Stored parsed data in cache as {key}")
+
+    evict(constants.PARSE_CACHE_MAX_BYTES)
+    return True
+
+
+def evict(max_bytes: int):
+    """Delete the least recently used entries until the whole cache fits within the given size."""
+    cache_dir = get_parse_cache_dir()
+    if not cache_dir.exists():
+        return
+    entries = []
+    for path in cache_dir.iterdir():
+        # Entries which are still being written belong to whoever is writing them.
+        if path.suffix == ".tmp" or not path.is_file():
+            continue
+        try:
+            entries.append((path, path.stat()))
+        except FileNotFoundError:
+            # Already evicted by another process.
+            continue
+    total = sum(stat.st_size for _, stat in entries)
+    for path, stat in sorted(entries, key=lambda e: e[1].st_mtime):
+        if total <= max_bytes:
+            break
+        path.unlink(missing_ok=True)
+        total -= stat.st_size
+        _log.debug(f"Evicted {path.name} from parse cache")
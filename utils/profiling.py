@@ -0,0 +1,111 @@
+# Anything to do with profiling where exactly solutions spend their time goes here.
+import cProfile
+import logging
+import os
+import pstats
+from collections import defaultdict
+from pathlib import Path
+
+from utils import constants, filehandler, misc
+
+PROFILE_PHASES = ("parse", "part1", "part2")
+_log = logging.getLogger(constants.ROOT_LOGGER + "." + __name__)
+
+
+class PhaseProfiler:
+    """A deterministic profiler which only ever runs during the selected phases of solving a puzzle."""
+
+    def __init__(self, phases: str | list[str] = "all"):
+        if phases == "all":
+            phases = PROFILE_PHASES
+        elif isinstance(phases, str):
+            phases = [phases]
+        unknown = set(phases) - set(PROFILE_PHASES)
+        if unknown:
+            raise ValueError(f"Cannot profile phases {unknown}, must be any of {PROFILE_PHASES}")
+        self.phases = tuple(phases)
+        self.profile = cProfile.Profile()
+
+    def call(self, phase: str, func, *args, **kwargs):
+        """Call the function, and profile it if it belongs to one of the selected phases."""
+        if phase not in self.phases:
+            return func(*args, **kwargs)
+        return self.profile.runcall(func, *args, **kwargs)
+
+    def get_stats(self) -> pstats.Stats:
+        stats = pstats.Stats(self.profile)
+        # Switching the profiler off again is the only trace it leaves of itself.
+        for func in [f for f in stats.stats if f[2] == "<method 'disable' of '_lsprof.Profiler' objects>"]:
+            del stats.stats[func]
+        return stats
+
+    def save(self, year: int, day: int) -> tuple[Path, Path]:
+        """Write the raw profile and its collapsed stacks to disk. Returns the paths of both files."""
+        profile_dir = filehandler.get_cache_dir() / constants.PROFILE_DIR
+        profile_dir.mkdir(parents=True, exist_ok=True)
+        name = f"{year}-{day:02}-{'+'.join(self.phases)}-{misc.unix_now()}"
+        stats_path = profile_dir / f"{name}.pstats"
+        collapsed_path = profile_dir / f"{name}.collapsed"
+
+        stats = self.get_stats()
+        stats.dump_stats(stats_path)
+        with open(collapsed_path, "w", encoding="utf-8") as file:
+            for stack, micros in sorted(collapse_stacks(stats).items()):
+                file.write(f"{stack} {micros}\n")
+        _log.info(f"Saved profile to {stats_path} and {collapsed_path.name}")
+        return stats_path, collapsed_path
+
+    def summary(self, top: int = 15) -> str:
+        """Get a printable table of the functions which spent the most time running their own code."""
+        stats = self.get_stats().stats
+        rows = [("self [ms]", "cumul. [ms]", "calls", "function")]
+        hottest = sorted(stats.items(), key=lambda item: item[1][2], reverse=True)[:top]
+        for func, (cc, nc, tt, ct, callers) in hottest:
+            calls = str(nc) if cc == nc else f"{nc}/{cc}"
+            rows.append((f"{tt * 1000:.3f}", f"{ct * 1000:.3f}", calls, _label(func)))
+
+        return "\n".join(misc.format_table(rows, ">>><"))
+
+
+def _label(func: tuple[str, int, str]) -> str:
+    """Turn a function as pstats knows it into a frame name which fits into the collapsed stack format."""
+    filename, lineno, name = func
+    if filename == "~":
+        # Built-in functions have no file.
+        return name.replace(" ", "_").replace(";", ",")
+    return f"{name}@{os.path.basename(filename)}:{lineno}".replace(" ", "_").replace(";", ",")
+
+
+def collapse_stacks(stats: pstats.Stats, max_depth: int = 64) -> dict[str, int]:
+    """Reconstruct approximate call stacks from the profile's caller graph, in the collapsed format used by
+    flamegraph tools. Each stack maps to the microseconds spent in its topmost function.
+
+    cProfile only records who called whom, so the time of functions called from several places is split up
+    proportionally to how much of it was spent on behalf of each caller."""
+    callees = defaultdict(dict)
+    roots = []
+    for func, (cc, nc, tt, ct, callers) in stats.stats.items():
+        if not callers:
+            roots.append(func)
+        for caller, edge in callers.items():
+            callees[caller][func] = edge[3]
+
+    stacks = defaultdict(float)
+    # Walk the graph depth-first, carrying the share of each function's time which belongs to the current path.
+    pending = [(root, (_label(root),), (root,), 1.0) for root in roots]
+    while pending:
+        func, path, seen, share = pending.pop()
+        tt = stats.stats[func][2]
+        stacks[";".join(path)] += tt * share * 1e6
+        if len(path) >= max_depth:
+            continue
+        for child, child_ct in callees[func].items():
+            total = stats.stats[child][3]
+            # Recursion would otherwise never end, its time is already included in the outermost call.
+            if child in seen or total <= 0:
+                continue
+            child_share = share * min(1.0, child_ct / total)
+            if child_share * total * 1e6 >= 1:
+                pending.append((child, path + (_label(child),), seen + (child,), child_share))
+
+    return {stack: round(micros) for stack, micros in stacks.items() if round(micros) > 0}
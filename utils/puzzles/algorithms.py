@@ -1,73 +1,343 @@
+import functools
+import heapq
+import itertools
 import math
-from typing import Any, Callable
+from array import array
+from collections import deque
+from typing import Any, Callable, Hashable, Iterable
 
 from utils.puzzles.geometry import Grid, Point
 
 
-def dijkstra(grid: Grid, start: Point, end: Point, distance_func: Callable[[Point, Point], float | None]) -> float:
-    """Find the shortest path from start to end."""
-    # 1 - Mark all nodes as unvisited.
-    unvisited = [Point(x, y) for x in range(grid.num_cols) for y in range(grid.num_rows)]
-    # 2 - Assign to every node a tentative distance value.
-    nodes = Grid(size=grid.get_size(), default=math.inf)
-    nodes[start] = 0
-    current = start
-    while len(unvisited) > 0:
-        # 3 - For the current node, consider all neighbours and calculate their tentative distances.
-        neighbours = nodes.get_neighbours(current)
-        for n in neighbours:
-            # Only consider unvisited ones.
-            if n in unvisited:
-                distance = distance_func(current, n)
-                # If the neighbour should not be considered for some special reason, the distance will be None.
-                if distance is not None and nodes[current] + distance < nodes[n]:
-                    nodes[n] = nodes[current] + distance
-        # 4 - When we are done considering neighbours, mark the current node as visited.
-        unvisited.remove(current)
-        if current == end:
-            break
-        # 5 - Select the unvisited node with the smallest tentative distance as the new current node.
-        current = min(unvisited, key=lambda v: nodes[v])
-        # 6 - If the destination node is marked visited, or the shortest available path is infinity, stop.
-        if nodes[current] == math.inf:
-            break
-
-    # print(nodes.pretty_print())
-    return nodes[end]
-
-
-def _merge(left: list, right: list, comp_func: Callable[[Any, Any], bool]) -> list:
-    if len(left) == 0:
-        return right
-    if len(right) == 0:
-        return left
-
-    result = []
-    idx_l = idx_r = 0
-    # Iterate through both arrays until all elements are in the result.
-    while len(result) < len(left) + len(right):
-        # Choose the "smaller" element.
-        if comp_func(left[idx_l], right[idx_r]):
-            result.append(left[idx_l])
-            idx_l += 1
+class SearchResult:
+    """The outcome of a shortest path search: distances from the nearest source, the target which was reached first,
+    if any, and, if tracked, the predecessor of every node on its shortest path."""
+
+    def __init__(self, distances: Grid | dict, predecessors: array | dict | None, target=None, expanded: int = 0):
+        self.distances = distances
+        self.predecessors = predecessors
+        self.target = target
+        # The number of nodes whose neighbours were looked at, i.e. how much of the graph had to be searched.
+        self.expanded = expanded
+
+    def distance(self, node=None) -> float:
+        """Get the distance to the given node, or to the target which was reached. Whole distances come back as ints."""
+        node = self.target if node is None else node
+        if node is None:
+            return math.inf
+        if isinstance(self.distances, Grid):
+            distance = self.distances[node]
         else:
-            result.append(right[idx_r])
-            idx_r += 1
-        # If the end of either array is reached, append the rest of the other.
-        if idx_l == len(left):
-            result += right[idx_r:]
-            break
-        if idx_r == len(right):
-            result += left[idx_l:]
-            break
-
-    return result
-
-
-def merge_sort(array: list, comparison_func: Callable[[Any, Any], bool]) -> list:
-    """Sort the given array using the MergeSort algorithm."""
-    if len(array) < 2:
-        return array
-    middle = len(array) // 2
-    # Sort the array by recursively splitting it in half, sorting those halves, and then merging them back together.
-    return _merge(merge_sort(array[:middle], comparison_func), merge_sort(array[middle:], comparison_func), comparison_func)
+            distance = self.distances.get(node, math.inf)
+        return int(distance) if isinstance(distance, float) and distance.is_integer() else distance
+
+    def path(self, node=None) -> list:
+        """Get the nodes along the shortest path from a source to the given node, or to the target which was reached.
+        Grid searches work on flat indices, so that is what their paths are made of."""
+        if self.predecessors is None:
+            raise ValueError("Predecessors were not tracked, search again with 'paths' enabled!")
+        node = self.target if node is None else node
+        if node is None or self.distance(node) == math.inf:
+            return []
+        if isinstance(self.distances, Grid):
+            # Sources have no predecessor, which is marked by -1 in a grid.
+            node = _to_index(self.distances, node)
+            path = [node]
+            while (node := self.predecessors[node]) != -1:
+                path.append(node)
+        else:
+            path = [node]
+            while (node := self.predecessors.get(node)) is not None:
+                path.append(node)
+        return path[::-1]
+
+
+def dijkstra_graph(sources: Iterable[Hashable], neighbours: Callable[[Hashable], Iterable[tuple[Hashable, float]]],
+                   targets: Iterable[Hashable] = None, paths: bool = False) -> SearchResult:
+    """Find the shortest paths from the nearest of the sources through any graph, given a function which yields the
+    neighbours of a node along with the distance to each.
+
+    Given targets, the search stops as soon as the nearest one of them is reached. Otherwise, the distance to every
+    reachable node is found.
+    """
+    distances = {}
+    predecessors = {} if paths else None
+    target_set = None if targets is None else set(targets)
+    visited = set()
+    heap = []
+    # The counter breaks ties between equally distant nodes, which may not be comparable.
+    counter = itertools.count()
+    for source in sources:
+        distances[source] = 0
+        heap.append((0, next(counter), source))
+    heapq.heapify(heap)
+
+    while heap:
+        distance, _, current = heapq.heappop(heap)
+        if current in visited:
+            continue
+        visited.add(current)
+        if target_set is not None and current in target_set:
+            return SearchResult(distances, predecessors, current, len(visited))
+        for neighbour, step in neighbours(current):
+            if neighbour in visited:
+                continue
+            new_distance = distance + step
+            if new_distance < distances.get(neighbour, math.inf):
+                distances[neighbour] = new_distance
+                if paths:
+                    predecessors[neighbour] = current
+                heapq.heappush(heap, (new_distance, next(counter), neighbour))
+
+    return SearchResult(distances, predecessors, None, len(visited))
+
+
+def dijkstra_grid(grid: Grid, sources: Iterable[Point | int], distance_func: Callable[[int, int], float | None],
+                  targets: Iterable[Point | int] = None, diagonal: bool = False, wrap: bool = False,
+                  paths: bool = False) -> SearchResult:
+    """Find the shortest paths from the nearest of the sources across a grid, working on flat indices throughout.
+
+    The distance function gets the flat indices of a cell and its neighbour, and returns None if the step between them
+    is impossible. Given targets, the search stops as soon as the nearest one of them is reached. Otherwise, the whole
+    distance map is filled in.
+    """
+    offsets, adjacent = grid.neighbour_index(diagonal, wrap)
+    size = grid.num_rows * grid.num_cols
+    distance_grid = Grid(size=grid.get_size(), default=math.inf, typecode="d")
+    distances = distance_grid._values
+    visited = bytearray(size)
+    predecessors = array("q", [-1]) * size if paths else None
+    target_set = None if targets is None else {_to_index(grid, target) for target in targets}
+    heap = []
+    for source in sources:
+        source = _to_index(grid, source)
+        distances[source] = 0
+        heap.append((0, source))
+    heapq.heapify(heap)
+
+    expanded = 0
+    while heap:
+        distance, current = heapq.heappop(heap)
+        if visited[current]:
+            continue
+        visited[current] = 1
+        expanded += 1
+        if target_set is not None and current in target_set:
+            return SearchResult(distance_grid, predecessors, current, expanded)
+        for neighbour in adjacent[offsets[current]:offsets[current + 1]]:
+            if visited[neighbour]:
+                continue
+            step = distance_func(current, neighbour)
+            # If the neighbour should not be considered for some special reason, the distance will be None.
+            if step is None:
+                continue
+            new_distance = distance + step
+            if new_distance < distances[neighbour]:
+                distances[neighbour] = new_distance
+                if paths:
+                    predecessors[neighbour] = current
+                heapq.heappush(heap, (new_distance, neighbour))
+
+    return SearchResult(distance_grid, predecessors, None, expanded)
+
+
+def bfs_grid(grid: Grid, sources: Iterable[Point | int], passable: Callable[[Any, Any], bool], reverse: bool = False,
+             diagonal: bool = False, wrap: bool = False) -> Grid:
+    """Find the number of steps from the nearest of the sources to every cell of a grid, where every step costs one.
+
+    The passability function gets the values of the cell a step goes from and the cell it goes to. In reverse, steps
+    are taken against that direction instead, which gives the number of steps from every cell to the nearest source.
+    Cells which cannot be reached at all are -1 in the returned grid.
+    """
+    offsets, adjacent = grid.neighbour_index(diagonal, wrap)
+    values = grid._values
+    distance_grid = Grid(size=grid.get_size(), default=-1, typecode="i")
+    distances = distance_grid._values
+    queue = deque()
+    for source in sources:
+        source = _to_index(grid, source)
+        if distances[source] == -1:
+            distances[source] = 0
+            queue.append(source)
+
+    while queue:
+        current = queue.popleft()
+        value = values[current]
+        distance = distances[current] + 1
+        for neighbour in adjacent[offsets[current]:offsets[current + 1]]:
+            if distances[neighbour] != -1:
+                continue
+            if passable(values[neighbour], value) if reverse else passable(value, values[neighbour]):
+                distances[neighbour] = distance
+                queue.append(neighbour)
+
+    return distance_grid
+
+
+def manhattan(grid: Grid, min_step: float = 1, wrap: bool = False) -> Callable[[int, int], float]:
+    """Get a heuristic for the distance between two cells of the grid if every step goes in one of the cardinal
+    directions and costs at least min_step."""
+    cols, rows = grid.num_cols, grid.num_rows
+
+    def heuristic(a: int, b: int) -> float:
+        dy, dx = abs(a // cols - b // cols), abs(a % cols - b % cols)
+        if wrap:
+            dx, dy = min(dx, cols - dx), min(dy, rows - dy)
+        return (dx + dy) * min_step
+    return heuristic
+
+
+def chebyshev(grid: Grid, min_step: float = 1, wrap: bool = False) -> Callable[[int, int], float]:
+    """Get a heuristic for the distance between two cells of the grid if diagonal steps are allowed as well, and every
+    step costs at least min_step."""
+    cols, rows = grid.num_cols, grid.num_rows
+
+    def heuristic(a: int, b: int) -> float:
+        dy, dx = abs(a // cols - b // cols), abs(a % cols - b % cols)
+        if wrap:
+            dx, dy = min(dx, cols - dx), min(dy, rows - dy)
+        return max(dx, dy) * min_step
+    return heuristic
+
+
+def a_star(grid: Grid, start: Point | int, end: Point | int, distance_func: Callable[[int, int], float | None],
+           heuristic: Callable[[int, int], float] = None, diagonal: bool = False, wrap: bool = False,
+           paths: bool = False) -> SearchResult:
+    """Find the shortest path from start to end across a grid, trying the most promising cells first.
+
+    Takes the same distance function as dijkstra_grid. The heuristic estimates the remaining distance between two flat
+    indices, and must never overestimate it, nor shrink by more than the step taken. It defaults to the Manhattan or
+    Chebyshev distance, depending on whether diagonal steps are allowed.
+    """
+    if heuristic is None:
+        heuristic = (chebyshev if diagonal else manhattan)(grid, wrap=wrap)
+    start, end = _to_index(grid, start), _to_index(grid, end)
+    offsets, adjacent = grid.neighbour_index(diagonal, wrap)
+    distance_grid = Grid(size=grid.get_size(), default=math.inf, typecode="d")
+    distances = distance_grid._values
+    visited = bytearray(grid.num_rows * grid.num_cols)
+    predecessors = array("q", [-1]) * len(visited) if paths else None
+    distances[start] = 0
+    heap = [(heuristic(start, end), 0, start)]
+
+    expanded = 0
+    while heap:
+        _, distance, current = heapq.heappop(heap)
+        if visited[current]:
+            continue
+        visited[current] = 1
+        expanded += 1
+        if current == end:
+            return SearchResult(distance_grid, predecessors, end, expanded)
+        for neighbour in adjacent[offsets[current]:offsets[current + 1]]:
+            if visited[neighbour]:
+                continue
+            step = distance_func(current, neighbour)
+            if step is None:
+                continue
+            new_distance = distance + step
+            if new_distance < distances[neighbour]:
+                distances[neighbour] = new_distance
+                if paths:
+                    predecessors[neighbour] = current
+                heapq.heappush(heap, (new_distance + heuristic(neighbour, end), new_distance, neighbour))
+
+    return SearchResult(distance_grid, predecessors, None, expanded)
+
+
+def bidirectional_search(grid: Grid, start: Point | int, end: Point | int,
+                         distance_func: Callable[[int, int], float | None], diagonal: bool = False, wrap: bool = False,
+                         paths: bool = False) -> SearchResult:
+    """Find the shortest path from start to end across a grid by searching from both ends until the two meet.
+
+    Takes the same distance function as dijkstra_grid, and with every step costing the same, it is a bidirectional
+    breadth-first search. Only the distance and path to the end are exact, the distances to any other cells are not.
+    """
+    start, end = _to_index(grid, start), _to_index(grid, end)
+    offsets, adjacent = grid.neighbour_index(diagonal, wrap)
+    size = grid.num_rows * grid.num_cols
+    forward_grid = Grid(size=grid.get_size(), default=math.inf, typecode="d")
+    # Index 0 searches forwards from the start, index 1 backwards from the end, along edges in reverse.
+    distances = (forward_grid._values, array("d", [math.inf]) * size)
+    visited = (bytearray(size), bytearray(size))
+    links = (array("q", [-1]) * size, array("q", [-1]) * size)
+    heaps = ([(0, start)], [(0, end)])
+    distances[0][start] = distances[1][end] = 0
+    best, meeting = (0, start) if start == end else (math.inf, None)
+
+    expanded = 0
+    while heaps[0] and heaps[1] and heaps[0][0][0] + heaps[1][0][0] < best:
+        # Always continue on the side with less left to explore.
+        side = 0 if len(heaps[0]) <= len(heaps[1]) else 1
+        distance, current = heapq.heappop(heaps[side])
+        if visited[side][current]:
+            continue
+        visited[side][current] = 1
+        expanded += 1
+        other = distances[1 - side]
+        for neighbour in adjacent[offsets[current]:offsets[current + 1]]:
+            if visited[side][neighbour]:
+                continue
+            step = distance_func(current, neighbour) if side == 0 else distance_func(neighbour, current)
+            if step is None:
+                continue
+            new_distance = distance + step
+            if new_distance < distances[side][neighbour]:
+                distances[side][neighbour] = new_distance
+                links[side][neighbour] = current
+                heapq.heappush(heaps[side], (new_distance, neighbour))
+            # The two searches touch, which may be a shorter way through than found so far.
+            if new_distance + other[neighbour] < best:
+                best, meeting = new_distance + other[neighbour], neighbour
+                if side == 1:
+                    # Make sure that the path through the meeting point continues from the current cell.
+                    links[1][neighbour] = current
+
+    if meeting is None:
+        return SearchResult(forward_grid, links[0] if paths else None, None, expanded)
+    forward_grid[end] = best
+    if paths:
+        # Hook the backward half of the path onto the forward one, so it reads from start to end.
+        node = meeting
+        while node != end:
+            links[0][links[1][node]] = node
+            node = links[1][node]
+    return SearchResult(forward_grid, links[0] if paths else None, end, expanded)
+
+
+def dijkstra(grid: Grid, start: Point, end: Point, distance_func: Callable[[int, int], float | None]) -> float:
+    """Find the shortest path from start to end.
+
+    The distance function gets the flat grid indices of the current node and its neighbour.
+    """
+    return dijkstra_grid(grid, [start], distance_func, targets=[end]).distance()
+
+
+def _to_index(grid: Grid, node: Point | int) -> int:
+    return node if type(node) is int else grid.to_index(node)
+
+
+def three_way(in_order: Callable[[Any, Any], bool | None]) -> Callable[[Any, Any], int]:
+    """Turn a function which tells whether two items are in the right order into a three-way comparison, which is
+    negative, zero or positive if the first item sorts before, alongside or after the second."""
+    def compare(left, right) -> int:
+        if in_order(left, right):
+            return -1
+        return 1 if in_order(right, left) else 0
+    return compare
+
+
+def cmp_sort(items: Iterable, cmp: Callable[[Any, Any], int]) -> list:
+    """Sort the items by a three-way comparison, keeping equal items in their original order."""
+    return sorted(items, key=functools.cmp_to_key(cmp))
+
+
+def count_less(items: Iterable, probe, cmp: Callable[[Any, Any], int]) -> int:
+    """Count the items which sort before the probe, in one comparison per item."""
+    return sum(1 for item in items if cmp(item, probe) < 0)
+
+
+def rank_of(items: Iterable, probe, cmp: Callable[[Any, Any], int]) -> int:
+    """Find the position, counting from 1, at which the probe ends up if it were sorted along with the items, ahead of
+    any items equal to it. The probe itself may be among the items, in which case it is not counted twice."""
+    return sum(1 for item in items if item is not probe and cmp(item, probe) < 0) + 1
@@ -1,72 +1,79 @@
 # Classes which help with modeling geometry.
+import pickle
+from array import array
 from math import sqrt
+from operator import itemgetter
 from typing import Any, Sequence
 
+# Creates points without going through Point.__new__, which matters when creating millions of them.
+_new_tuple = tuple.__new__
 
-class Point:
-    """A point in a coordinate system."""
 
-    def __init__(self, x: int, y: int):
-        self.x = x
-        self.y = y
+class Point(tuple):
+    """An immutable point in a coordinate system. Being a tuple, it is hashable and equal to the plain (x, y) tuple.
+
+    Arithmetic works with anything that can be indexed like a pair, such as other points or (dx, dy) tuples.
+    """
+
+    __slots__ = ()
+
+    def __new__(cls, x: int, y: int):
+        return _new_tuple(cls, (x, y))
+
+    # Faster than a regular property, as the lookup happens entirely in C.
+    x = property(itemgetter(0))
+    y = property(itemgetter(1))
 
     def __add__(self, other):
-        if isinstance(other, type(self)):
-            return Point(self.x + other.x, self.y + other.y)
-        if isinstance(other, Sequence) and len(other) == 2:
-            return Point(self.x + other[0], self.y + other[1])
-        raise ValueError
+        return _new_tuple(Point, (self[0] + other[0], self[1] + other[1]))
+
+    __radd__ = __add__
+
+    def __getnewargs__(self):
+        # Tuples would otherwise be unpickled by passing the whole tuple as a single argument.
+        return self[0], self[1]
 
-    def __eq__(self, other):
-        return self.x == other.x and self.y == other.y
+    def __repr__(self):
+        return f"Point({self[0]}, {self[1]})"
 
     def __str__(self):
-        return f"({self.x}, {self.y})"
+        return f"({self[0]}, {self[1]})"
 
     def __sub__(self, other):
-        if isinstance(other, type(self)):
-            return Point(self.x - other.x, self.y - other.y)
-        if isinstance(other, Sequence) and len(other) == 2:
-            return Point(self.x - other[0], self.y - other[1])
-        raise TypeError
+        return _new_tuple(Point, (self[0] - other[0], self[1] - other[1]))
+
+    def __rsub__(self, other):
+        return _new_tuple(Point, (other[0] - self[0], other[1] - self[1]))
 
     def copy(self) -> "Point":
-        return Point(self.x, self.y)
+        # Points never change, so they can be shared freely.
+        return self
 
     def distance(self, other: "Point") -> float:
-        x = (self.x - other.x) ** 2
-        y = (self.y - other.y) ** 2
+        x = (self[0] - other[0]) ** 2
+        y = (self[1] - other[1]) ** 2
         return sqrt(x + y)
 
-    def move(self, x=None, y=None, delta=None):
-        if x is not None or y is not None:
-            self.x += x if x is not None else 0
-            self.y += y if y is not None else 0
-            return
-        if isinstance(delta, type(self)):
-            self.x += delta.x
-            self.y += delta.y
-            return
-        if isinstance(delta, Sequence) and len(delta) == 2:
-            self.x += delta[0]
-            self.y += delta[1]
-            return
-        raise TypeError
+    def move(self, x: int = 0, y: int = 0, delta=None) -> "Point":
+        """Get a new point which is moved by the given amounts, or by the delta. Points are never moved in place."""
+        if delta is not None:
+            return _new_tuple(Point, (self[0] + delta[0], self[1] + delta[1]))
+        return _new_tuple(Point, (self[0] + x, self[1] + y))
 
     def signage(self, max: int = 1):
         """Return a new point with this point's positions capped at 1."""
-        if self.x != 0:
-            x = self.x // abs(self.x) * max
+        if self[0] != 0:
+            x = self[0] // abs(self[0]) * max
         else:
             x = 0
-        if self.y != 0:
-            y = self.y // abs(self.y) * max
+        if self[1] != 0:
+            y = self[1] // abs(self[1]) * max
         else:
             y = 0
         return Point(x, y)
 
     def to_tuple(self) -> tuple[int, int]:
-        return self.x, self.y
+        return self[0], self[1]
 
 
 class Line:
@@ -92,10 +99,47 @@ class Line:
         return f"({self.a.x},{self.a.y} -> {self.b.x},{self.b.y})"
 
 
+# Grids can store their values compactly in a bytearray rather than a list, as well as in an array of any type.
+BYTEARRAY = "bytearray"
+# The offsets of the neighbours of a cell as (dx, dy), in clockwise order starting from the one to the north.
+CARDINAL_DELTAS = ((0, -1), (1, 0), (0, 1), (-1, 0))
+ALL_DELTAS = ((0, -1), (1, -1), (1, 0), (1, 1), (0, 1), (-1, 1), (-1, 0), (-1, -1))
+
+
+def _make_storage(typecode: str | None, values) -> list | array | bytearray:
+    if typecode is None:
+        return values if isinstance(values, list) else list(values)
+    if typecode == BYTEARRAY:
+        return bytearray(values)
+    return array(typecode, values)
+
+
+def _rebuild_grid(typecode: str, buffer, num_rows: int, num_cols: int) -> "Grid":
+    """Restore a pickled grid whose values were stored as a raw buffer."""
+    grid = Grid.__new__(Grid)
+    grid.typecode = typecode
+    grid.num_rows, grid.num_cols = num_rows, num_cols
+    grid._neighbours = {}
+    if typecode == BYTEARRAY:
+        grid._values = bytearray(buffer)
+    else:
+        grid._values = array(typecode)
+        grid._values.frombytes(buffer)
+    return grid
+
+
 class Grid:
+    """A rectangular grid of values, stored row by row in one flat sequence.
+
+    By default, values are kept in a list. Passing the typecode of an array, e.g. 'b' for small integers, 'i' for
+    integers or 'd' for floats, or BYTEARRAY instead stores them compactly without an object per cell.
+    """
 
     def __init__(self, values: list = None, ncol: int = None, nrow: int = None, size: tuple[int, int] = None,
-                 default=0):
+                 default=0, typecode: str = None):
+        self.typecode = typecode
+        # The cached neighbour indices, by whether they include diagonals and wrap around the edges.
+        self._neighbours = {}
         # "values" here expects data to come in row by row, column by column.
         if values:
             if ncol is not None:
@@ -106,27 +150,51 @@ class Grid:
                 self.num_cols = len(values) // nrow
             else:
                 raise AttributeError("One of 'ncol' or 'nrow' must be given if 'values' was passed!")
-            self._values = values
+            self._values = _make_storage(typecode, values)
         else:
             if not size:
                 raise AttributeError("If 'values' is not defined, 'size' must be passed!")
-            self._values = [default for _ in range(size[0] * size[1])]
+            self._values = _make_storage(typecode, [default]) * (size[0] * size[1])
             self.num_rows, self.num_cols = size
 
     def __getitem__(self, item):
+        # Check for the exact types first, which is much faster than going through isinstance.
+        cls = type(item)
+        if cls is int:
+            return self._values[item]
+        # Points are sequences too, but are indexed by (x, y) rather than (row, column).
+        if cls is Point:
+            return self._values[item[1] * self.num_cols + item[0]]
         if isinstance(item, int):
             return self._values[item]
         if isinstance(item, Point):
-            return self._values[item.y * self.num_cols + item.x]
+            return self._values[item[1] * self.num_cols + item[0]]
         if isinstance(item, Sequence) and len(item) == 2:
             return self._values[item[0] * self.num_cols + item[1]]
         raise TypeError
 
+    def __getstate__(self):
+        # The neighbour index is quick to build again, no need to make pickles any larger.
+        state = self.__dict__.copy()
+        state["_neighbours"] = {}
+        return state
+
+    def __reduce_ex__(self, protocol):
+        # Typed values can be pickled as one raw buffer, which can even be stored out-of-band.
+        if protocol >= 5 and self.typecode is not None:
+            return _rebuild_grid, (self.typecode, pickle.PickleBuffer(self._values), self.num_rows, self.num_cols)
+        return super().__reduce_ex__(protocol)
+
     def __setitem__(self, key, value):
-        if isinstance(key, int):
+        cls = type(key)
+        if cls is int:
+            self._values[key] = value
+        elif cls is Point:
+            self._values[key[1] * self.num_cols + key[0]] = value
+        elif isinstance(key, int):
             self._values[key] = value
         elif isinstance(key, Point):
-            self._values[key.y * self.num_cols + key.x] = value
+            self._values[key[1] * self.num_cols + key[0]] = value
         elif isinstance(key, Sequence) and len(key) == 2:
             self._values[key[0] * self.num_cols + key[1]] = value
         else:
@@ -135,15 +203,21 @@ class Grid:
     def __str__(self):
         return f"Grid{self.get_size()}"
 
+    def _view(self) -> list | memoryview:
+        """Get something to slice the values with. Typed values are sliced without copying them."""
+        return self._values if self.typecode is None else memoryview(self._values)
+
     def by_col(self):
-        """Get all values in the grid, organised by column."""
+        """Get all values in the grid, organised by column. Typed grids yield views rather than copies."""
+        values = self._view()
         for col_idx in range(self.num_cols):
-            yield [self._values[col_idx + row_idx * self.num_cols] for row_idx in range(self.num_rows)]
+            yield values[col_idx::self.num_cols]
 
     def by_row(self):
-        """Get all values in the grid, organised by row."""
+        """Get all values in the grid, organised by row. Typed grids yield views rather than copies."""
+        values = self._view()
         for row_idx in range(self.num_rows):
-            yield [self._values[row_idx * self.num_cols + col_idx] for col_idx in range(self.num_cols)]
+            yield values[row_idx * self.num_cols:(row_idx + 1) * self.num_cols]
 
     def get_neighbours(self, idx: Point) -> list[Point]:
         """Get all neighbouring elements of the element at the given grid index in clockwise order."""
@@ -158,6 +232,47 @@ class Grid:
             neighbours.append(Point(idx.x - 1, idx.y))
         return neighbours
 
+    def neighbour_index(self, diagonal: bool = False, wrap: bool = False) -> tuple[array, array]:
+        """Get the neighbours of all cells by their flat indices, in compressed sparse row format.
+
+        The neighbours of the cell at index i are targets[offsets[i]:offsets[i + 1]], in clockwise order starting from
+        the one to the north. The index is built once and cached, so graph algorithms can fetch it up front and then
+        work on integers only.
+        """
+        key = (diagonal, wrap)
+        if key not in self._neighbours:
+            self._neighbours[key] = self._build_neighbour_index(ALL_DELTAS if diagonal else CARDINAL_DELTAS, wrap)
+        return self._neighbours[key]
+
+    def _build_neighbour_index(self, deltas: tuple, wrap: bool) -> tuple[array, array]:
+        rows, cols = self.num_rows, self.num_cols
+        offsets = array("q", [0])
+        targets = array("q")
+        for y in range(rows):
+            for x in range(cols):
+                start = len(targets)
+                for dx, dy in deltas:
+                    nx, ny = x + dx, y + dy
+                    if wrap:
+                        nx %= cols
+                        ny %= rows
+                        target = ny * cols + nx
+                        # On small grids, wrapping around may well lead back to the same cell.
+                        if target == y * cols + x or target in targets[start:]:
+                            continue
+                    elif 0 <= nx < cols and 0 <= ny < rows:
+                        target = ny * cols + nx
+                    else:
+                        continue
+                    targets.append(target)
+                offsets.append(len(targets))
+        return offsets, targets
+
+    def neighbour_indices(self, idx: int, diagonal: bool = False, wrap: bool = False) -> array:
+        """Get the flat indices of all neighbours of the cell at the given flat index, in clockwise order."""
+        offsets, targets = self.neighbour_index(diagonal, wrap)
+        return targets[offsets[idx]:offsets[idx + 1]]
+
     def get_size(self) -> tuple[int, int]:
         """Get the number of rows and columns in the grid."""
         return self.num_rows, self.num_cols
@@ -187,6 +302,10 @@ class Grid:
         """Convert a values list index to its index in the grid."""
         return Point(index % self.num_cols, index // self.num_cols)
 
+    def to_index(self, point: Point) -> int:
+        """Convert a position in the grid to its flat index."""
+        return point[1] * self.num_cols + point[0]
+
     def values(self):
         """Yield all values in the grid in one flat list."""
         yield from self._values
@@ -204,15 +323,14 @@ class DictGrid:
     def add_line(self, line: Line):
         """Add a series of points to the grid."""
         for point in line:
-            self._grid[point.to_tuple()] = 1
+            self._grid[point] = 1
 
     def add_point(self, point: Point, value: Any = 1):
         """Add a point to the grid."""
-        self._grid[point.to_tuple()] = value
+        self._grid[point] = value
 
     def get(self, point: Point | tuple[int, int]):
         """Gets the value associated with the given point, or None if it does not exist."""
-        if isinstance(point, Point):
-            point = point.to_tuple()
+        # Points hash and compare just like plain tuples, so either works as a key.
         return self._grid.get(point, None)
 
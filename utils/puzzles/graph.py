@@ -0,0 +1,159 @@
+# Anything to do with graphs that are not simply a grid goes here.
+import math
+from array import array
+from collections import deque
+from typing import Any, Callable, Hashable, Iterable, Iterator
+
+from utils.puzzles.algorithms import SearchResult, dijkstra_graph
+from utils.puzzles.geometry import Grid
+
+
+class Graph:
+    """A directed, weighted graph, with its nodes numbered from 0 and the edges of each node stored next to each other
+    in flat arrays (compressed sparse row format).
+
+    Every node has a label, which is whatever it stands for in the puzzle, e.g. the flat index of a grid cell.
+    """
+
+    def __init__(self, labels: list[Hashable], edges: Iterable[tuple[int, int, float]]):
+        self.labels = labels
+        self._nodes = {label: node for node, label in enumerate(labels)}
+        # Of parallel edges, only the shortest one matters.
+        shortest = {}
+        for source, target, weight in edges:
+            if weight < shortest.get((source, target), math.inf):
+                shortest[(source, target)] = weight
+        self.offsets = array("q", [0]) * (len(labels) + 1)
+        self.targets = array("q", [0]) * len(shortest)
+        self.weights = array("d", [0]) * len(shortest)
+        for source, _ in shortest:
+            self.offsets[source + 1] += 1
+        for node in range(len(labels)):
+            self.offsets[node + 1] += self.offsets[node]
+        filled = self.offsets[:-1]
+        for (source, target), weight in sorted(shortest.items()):
+            self.targets[filled[source]] = target
+            self.weights[filled[source]] = weight
+            filled[source] += 1
+
+    def __len__(self):
+        return len(self.labels)
+
+    def __str__(self):
+        return f"Graph({len(self)} nodes, {len(self.targets)} edges)"
+
+    def node(self, label: Hashable) -> int:
+        """Get the node with the given label."""
+        return self._nodes[label]
+
+    def neighbours(self, node: int) -> Iterator[tuple[int, float]]:
+        """Yield the nodes which can be reached from the node in one step, along with the weight of that step."""
+        start, end = self.offsets[node], self.offsets[node + 1]
+        return zip(self.targets[start:end], self.weights[start:end])
+
+    def edges(self) -> Iterator[tuple[int, int, float]]:
+        """Yield every edge as its source, target and weight."""
+        for node in range(len(self)):
+            for target, weight in self.neighbours(node):
+                yield node, target, weight
+
+    def contract(self, keep: Iterable[Hashable] = ()) -> "Graph":
+        """Get a smaller graph in which every corridor, a chain of nodes which only connect to the nodes before and
+        after them, is replaced by a single edge as long as the whole corridor.
+
+        Nodes with the given labels are never contracted, so they can still be searched from or for. Nodes with no
+        edges at all are dropped, unless kept.
+        """
+        # Corridors are about which nodes touch, regardless of direction.
+        touching = [set() for _ in range(len(self))]
+        for source, target, _ in self.edges():
+            if source != target:
+                touching[source].add(target)
+                touching[target].add(source)
+        kept = {self._nodes[label] for label in keep}
+        junctions = [node for node in range(len(self)) if node in kept or len(touching[node]) not in (0, 2)]
+        new_nodes = {node: new for new, node in enumerate(junctions)}
+
+        edges = []
+        for node in junctions:
+            for target, weight in self.neighbours(node):
+                previous = node
+                # Follow the corridor until it reaches a junction, as long as it can be followed in this direction.
+                while target not in new_nodes:
+                    following = next(other for other in touching[target] if other != previous)
+                    step = self._get_weight(target, following)
+                    if step is None:
+                        break
+                    previous, target, weight = target, following, weight + step
+                else:
+                    if target != node:
+                        edges.append((new_nodes[node], new_nodes[target], weight))
+
+        return Graph([self.labels[node] for node in junctions], edges)
+
+    def _get_weight(self, source: int, target: int) -> float | None:
+        start, end = self.offsets[source], self.offsets[source + 1]
+        for idx in range(start, end):
+            if self.targets[idx] == target:
+                return self.weights[idx]
+        return None
+
+    def bfs(self, sources: Iterable[int]) -> array:
+        """Find the number of edges on the way from the nearest source to every node, ignoring their weights.
+
+        Nodes which cannot be reached at all are -1.
+        """
+        steps = array("i", [-1]) * len(self)
+        queue = deque()
+        for source in sources:
+            if steps[source] == -1:
+                steps[source] = 0
+                queue.append(source)
+        while queue:
+            current = queue.popleft()
+            for neighbour in self.targets[self.offsets[current]:self.offsets[current + 1]]:
+                if steps[neighbour] == -1:
+                    steps[neighbour] = steps[current] + 1
+                    queue.append(neighbour)
+        return steps
+
+    def dijkstra(self, sources: Iterable[int], targets: Iterable[int] = None, paths: bool = False) -> SearchResult:
+        """Find the shortest paths from the nearest of the sources, stopping at the nearest target if any are given."""
+        return dijkstra_graph(sources, self.neighbours, targets, paths)
+
+    def floyd_warshall(self) -> list[list[float]]:
+        """Find the shortest distance between every pair of nodes, where distances[a][b] is the one from a to b.
+
+        Takes cubic time, so it is best used on a contracted graph.
+        """
+        distances = [[math.inf] * len(self) for _ in range(len(self))]
+        for node in range(len(self)):
+            distances[node][node] = 0
+        for source, target, weight in self.edges():
+            distances[source][target] = min(distances[source][target], weight)
+
+        for middle, via_row in enumerate(distances):
+            for row in distances:
+                to_middle = row[middle]
+                if to_middle == math.inf:
+                    continue
+                row[:] = [min(direct, to_middle + onwards) for direct, onwards in zip(row, via_row)]
+        return distances
+
+
+def from_grid(grid: Grid, passable: Callable[[Any, Any], bool], weight: Callable[[int, int], float] = None,
+              diagonal: bool = False, wrap: bool = False) -> Graph:
+    """Build a graph with a node for every cell of the grid, labelled by its flat index.
+
+    Just like in bfs_grid, the passability function gets the values of the cell a step goes from and the cell it goes
+    to. Every step costs one, unless a weight function is given, which gets their flat indices instead.
+    """
+    offsets, adjacent = grid.neighbour_index(diagonal, wrap)
+    values = grid._values
+    edges = []
+    for current in range(len(offsets) - 1):
+        value = values[current]
+        for neighbour in adjacent[offsets[current]:offsets[current + 1]]:
+            if passable(value, values[neighbour]):
+                edges.append((current, neighbour, 1 if weight is None else weight(current, neighbour)))
+    return Graph(list(range(len(offsets) - 1)), edges)
@@ -0,0 +1,251 @@
+# Memoisation for expensive recursive searches, with a bound on its size and insight into how well it works.
+import functools
+import hashlib
+import inspect
+import pickle
+import sqlite3
+import weakref
+from collections import OrderedDict
+from typing import Callable, Hashable
+
+from utils import constants, filehandler
+
+POLICIES = ("lru", "clock")
+# Results written to disk are committed in batches of this many, and whenever a puzzle is done.
+DISK_COMMIT_INTERVAL = 1000
+_MISSING = object()
+# Every memo in existence, so that their statistics can be collected after solving.
+_memos = weakref.WeakSet()
+
+
+class MemoStats:
+    """How often a memo could answer a call from what it remembered."""
+
+    def __init__(self, hits: int = 0, misses: int = 0, evictions: int = 0, disk_hits: int = 0):
+        self.hits = hits
+        self.misses = misses
+        self.evictions = evictions
+        # Calls which were not remembered in memory but on disk. These count as hits, too.
+        self.disk_hits = disk_hits
+
+    def __add__(self, other: "MemoStats") -> "MemoStats":
+        return MemoStats(self.hits + other.hits, self.misses + other.misses, self.evictions + other.evictions,
+                         self.disk_hits + other.disk_hits)
+
+    def __sub__(self, other: "MemoStats") -> "MemoStats":
+        return MemoStats(self.hits - other.hits, self.misses - other.misses, self.evictions - other.evictions,
+                         self.disk_hits - other.disk_hits)
+
+    def __bool__(self):
+        return bool(self.hits or self.misses)
+
+    def __str__(self):
+        rate = f" ({self.hits / (self.hits + self.misses):.0%})" if self else ""
+        disk = f", {self.disk_hits} from disk" if self.disk_hits else ""
+        return f"{self.hits} hits{rate}{disk}, {self.misses} misses, {self.evictions} evictions"
+
+    def copy(self) -> "MemoStats":
+        return MemoStats(self.hits, self.misses, self.evictions, self.disk_hits)
+
+    def to_dict(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions, "disk_hits": self.disk_hits}
+
+
+class Memo:
+    """Remembers the results of a function by a key made from its arguments. Create these through memoize().
+
+    Once maxsize results are remembered, one is forgotten for every new one. LRU forgets the one which was used least
+    recently, clock forgets one which has not been used since the clock hand last passed it, which is almost as good
+    but cheaper on every hit.
+    """
+
+    def __init__(self, func: Callable, maxsize: int = None, policy: str = "lru", key: Callable[..., Hashable] = None,
+                 disk: str = None):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown eviction policy '{policy}', must be one of {POLICIES}")
+        if maxsize is not None and maxsize < 1:
+            raise ValueError("A memo must be able to remember at least one result!")
+        functools.update_wrapper(self, func)
+        self.func = func
+        self.name = func.__qualname__
+        self.maxsize = maxsize
+        self.policy = policy
+        self.key = key
+        self.disk = disk
+        self.stats = MemoStats()
+        self._db = None
+        self._version = None
+        self._pending_writes = 0
+        self._entries = OrderedDict() if policy == "lru" and maxsize is not None else {}
+        if policy == "clock" and maxsize is not None:
+            # Every remembered result has a slot on the clock, with a flag telling whether it was used recently.
+            self._slots = []
+            self._referenced = bytearray(maxsize)
+            self._hand = 0
+        _memos.add(self)
+
+    def __call__(self, *args, **kwargs):
+        return self._call(args, args, kwargs)
+
+    def _call_method(self, instance, *args, **kwargs):
+        # Only a key hook gets to see the instance, the default key leaves it out.
+        return self._call((instance, *args), args, kwargs)
+
+    def _call(self, args: tuple, key_args: tuple, kwargs: dict):
+        if self.key is not None:
+            key = self.key(*args, **kwargs)
+        else:
+            key = (key_args, tuple(sorted(kwargs.items()))) if kwargs else key_args
+        value = self._get(key)
+        if value is not _MISSING:
+            self.stats.hits += 1
+            return value
+        if self.disk is not None:
+            value = self._disk_get(key)
+            if value is not _MISSING:
+                self.stats.hits += 1
+                self.stats.disk_hits += 1
+                self._put(key, value)
+                return value
+
+        self.stats.misses += 1
+        value = self.func(*args, **kwargs)
+        self._put(key, value)
+        if self.disk is not None:
+            self._disk_put(key, value)
+        return value
+
+    def __get__(self, instance, owner=None):
+        # Behave like a method when memoising one. The instance is left out of the key, since it would keep every
+        # instance alive, and changes to it, or things like open files, would get in the way of pickling it for disk.
+        if instance is None:
+            return self
+        return functools.partial(self._call_method, instance)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _get(self, key: Hashable):
+        if self.maxsize is None:
+            return self._entries.get(key, _MISSING)
+        if self.policy == "lru":
+            value = self._entries.get(key, _MISSING)
+            if value is not _MISSING:
+                self._entries.move_to_end(key)
+            return value
+        entry = self._entries.get(key)
+        if entry is None:
+            return _MISSING
+        self._referenced[entry[1]] = 1
+        return entry[0]
+
+    def _put(self, key: Hashable, value):
+        if self.maxsize is None:
+            self._entries[key] = value
+        elif self.policy == "lru":
+            self._entries[key] = value
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+        elif key in self._entries:
+            # A recursive call may already have remembered this result in the meantime.
+            self._entries[key][0] = value
+        elif len(self._slots) < self.maxsize:
+            self._entries[key] = [value, len(self._slots)]
+            self._slots.append(key)
+        else:
+            # Move the hand on until it points at a result which was not used since it last came by, and replace it.
+            while self._referenced[self._hand]:
+                self._referenced[self._hand] = 0
+                self._hand = (self._hand + 1) % self.maxsize
+            del self._entries[self._slots[self._hand]]
+            self.stats.evictions += 1
+            self._entries[key] = [value, self._hand]
+            self._slots[self._hand] = key
+            self._hand = (self._hand + 1) % self.maxsize
+
+    def _open_db(self) -> sqlite3.Connection:
+        if self._db is None:
+            path = filehandler.get_cache_dir() / constants.MEMO_CACHE_DIR / f"{self.disk}.sqlite"
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(path)
+            self._db.execute("""
+                CREATE TABLE IF NOT EXISTS results (
+                    version TEXT NOT NULL,
+                    key BLOB NOT NULL,
+                    value BLOB NOT NULL,
+                    PRIMARY KEY (version, key)
+                )
+            """)
+            # Results of an older version of the function may well be wrong now.
+            try:
+                source = inspect.getsource(self.func)
+            except (OSError, TypeError):
+                source = self.name
+            self._version = hashlib.sha256(source.encode("utf-8")).hexdigest()[:32]
+        return self._db
+
+    def _dump_key(self, key: Hashable) -> bytes:
+        try:
+            return pickle.dumps(key)
+        except (pickle.PicklingError, TypeError, AttributeError) as e:
+            raise TypeError(f"Memo '{self.name}' cannot store a key of type {type(key).__name__} on disk, use a key "
+                            f"hook which turns the arguments into plain values: {e}") from e
+
+    def _disk_get(self, key: Hashable):
+        row = self._open_db().execute("SELECT value FROM results WHERE version = ? AND key = ?",
+                                      (self._version, self._dump_key(key))).fetchone()
+        return _MISSING if row is None else pickle.loads(row[0])
+
+    def _disk_put(self, key: Hashable, value):
+        self._open_db().execute("INSERT OR REPLACE INTO results VALUES (?, ?, ?)",
+                                (self._version, self._dump_key(key), pickle.dumps(value)))
+        self._pending_writes += 1
+        if self._pending_writes >= DISK_COMMIT_INTERVAL:
+            self.flush()
+
+    def flush(self):
+        """Make sure that everything remembered on disk is actually written."""
+        if self._db is not None and self._pending_writes:
+            self._db.commit()
+            self._pending_writes = 0
+
+    def cache_clear(self):
+        """Forget everything remembered in memory. Results on disk are kept, and the statistics keep counting."""
+        self._entries.clear()
+        if self.policy == "clock" and self.maxsize is not None:
+            self._slots.clear()
+            self._referenced = bytearray(self.maxsize)
+            self._hand = 0
+
+
+def memoize(maxsize: int = None, policy: str = "lru", key: Callable[..., Hashable] = None,
+            disk: str = None) -> Callable[[Callable], Memo]:
+    """Decorate a function so that it remembers its results.
+
+    The key hook gets the same arguments as the function and returns what to remember the result by, e.g. a tuple of
+    small ints instead of whole states. Methods are remembered by their arguments only, so results must not depend on
+    the instance, unless the key hook, which gets the instance as well, picks out what matters about it. Given a name
+    for disk, results are also stored in a database in the cache directory, and survive between runs for as long as the
+    function does not change. Keys on disk are pickled, so they must pickle the same way in every run.
+    """
+    def decorator(func: Callable) -> Memo:
+        return Memo(func, maxsize, policy, key, disk)
+    return decorator
+
+
+def snapshot() -> dict[Memo, MemoStats]:
+    """Get the current statistics of every memo."""
+    return {memo: memo.stats.copy() for memo in _memos}
+
+
+def stats_since(before: dict[Memo, MemoStats]) -> dict[str, MemoStats]:
+    """Get the statistics of every memo which was used since the snapshot, by name. Memos which did not exist at the
+    time of the snapshot count from zero, and memos with the same name are added up."""
+    stats = {}
+    for memo in list(_memos):
+        memo.flush()
+        used = memo.stats - before.get(memo, MemoStats())
+        if used:
+            stats[memo.name] = stats.get(memo.name, MemoStats()) + used
+    return stats
@@ -0,0 +1,114 @@
+# Anything to do with running solutions, for one day or many at once, goes here.
+import contextlib
+import importlib
+import logging
+import os
+import time
+from types import ModuleType
+
+from utils import constants, misc
+from utils.lazy import lazy_import
+from utils.timing import SolveResult
+
+futures = lazy_import("concurrent.futures")
+telemetry = lazy_import("utils.telemetry")
+
+_log = logging.getLogger(constants.ROOT_LOGGER + "." + __name__)
+
+
+class DayResult:
+    """The outcome and wall-clock time of running the solution for a single day."""
+
+    def __init__(self, day: int, result: SolveResult = None, seconds: float = 0.0, error: str = None):
+        self.day = day
+        self.result = result
+        self.seconds = seconds
+        self.error = error
+
+    def __repr__(self):
+        return f"<DayResult {self.day}: {self.answers} in {self.seconds:.3f}s>"
+
+    @property
+    def answers(self) -> tuple:
+        return self.result.answers if self.result else (None, None)
+
+
+def import_solution(year: int, day: int) -> ModuleType:
+    """Import the solution module for a specific day."""
+    return importlib.import_module(f"{year}.{day:02}.solution")
+
+
+def run_day(year: int, day: int, test_input: bool, use_cache: bool = False, time_budget: float = None,
+            memory_budget: int = None, telemetry_target: str = None, telemetry_interval: float = 0.5,
+            enforce_budgets: bool = False) -> DayResult:
+    """Run the solution for a single day and time it from import to final answer."""
+    start = time.perf_counter()
+    try:
+        module = import_solution(year, day)
+        with telemetry.open_telemetry(telemetry_target, telemetry_interval, f"{year} Day {day}") as channel:
+            result = module.Solution().solve(test_input, use_cache, time_budget=time_budget,
+                                             memory_budget=memory_budget, telemetry=channel,
+                                             enforce_budgets=enforce_budgets)
+    except Exception as e:
+        _log.error(f"Day {day} failed: {type(e).__name__}: {e}")
+        return DayResult(day, seconds=time.perf_counter() - start, error=f"{type(e).__name__}: {e}")
+    return DayResult(day, result, time.perf_counter() - start)
+
+
+@contextlib.contextmanager
+def quiet_output():
+    """Silence the printed answers and informational logging of any solutions run within this context."""
+    logger = logging.getLogger(constants.ROOT_LOGGER)
+    level = logger.level
+    logger.setLevel(logging.WARNING)
+    try:
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            yield
+    finally:
+        logger.setLevel(level)
+
+
+def _run_day_quietly(year: int, day: int, test_input: bool, **kwargs) -> DayResult:
+    """Worker process entry point. Keeps the solution's own output from cluttering the summary."""
+    with quiet_output():
+        return run_day(year, day, test_input, **kwargs)
+
+
+def run_days(year: int, days: list[int], test_input: bool, jobs: int = None, use_cache: bool = False,
+             time_budget: float = None, memory_budget: int = None, telemetry_target: str = None,
+             telemetry_interval: float = 0.5, enforce_budgets: bool = True) -> list[DayResult]:
+    """Run the solutions for several days in parallel and return their results in day order. Unless told otherwise,
+    the budgets the solutions declare are enforced so that no single day can keep the rest waiting forever."""
+    if not days:
+        _log.error("No days to run")
+        return []
+    jobs = jobs or os.cpu_count() or 1
+    _log.info(f"Running AoC {year} Days {', '.join(map(str, days))} on {jobs} processes")
+    with futures.ProcessPoolExecutor(max_workers=min(jobs, len(days))) as pool:
+        pending = [pool.submit(_run_day_quietly, year, day, test_input, use_cache=use_cache, time_budget=time_budget,
+                               memory_budget=memory_budget, telemetry_target=telemetry_target,
+                               telemetry_interval=telemetry_interval, enforce_budgets=enforce_budgets)
+                   for day in days]
+        results = [future.result() for future in pending]
+
+    return sorted(results, key=lambda r: r.day)
+
+
+def format_summary(results: list[DayResult], total_seconds: float = None) -> str:
+    """Get a printable table of the answers and timings for every day that was run."""
+    rows = [("Day", "Part 1", "Part 2", "Time")]
+    for result in results:
+        if result.error:
+            rows.append((f"{result.day:02}", "ERROR", result.error, f"{result.seconds:.3f}s"))
+        else:
+            rows.append((f"{result.day:02}", str(result.answers[0]), str(result.answers[1]),
+                         f"{result.seconds:.3f}s"))
+
+    # Some answers span multiple lines, only the first one fits into the table.
+    rows = [tuple(cell.split("\n")[0] for cell in row) for row in rows]
+    lines = misc.format_table(rows, "<")
+    if total_seconds is not None:
+        lines.append(f"Total wall-clock time: {total_seconds:.3f}s, "
+                     f"sum of days: {sum(r.seconds for r in results):.3f}s")
+
+    return "\n".join(lines)
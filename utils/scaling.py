@@ -0,0 +1,86 @@
+# Anything to do with measuring how solutions cope with growing input goes here.
+import logging
+import math
+
+from utils import constants, misc, runner
+from utils.lazy import lazy_import
+
+supervisor = lazy_import("utils.supervisor")
+
+_log = logging.getLogger(constants.ROOT_LOGGER + "." + __name__)
+
+# Only the phases which depend on the size of the input are worth fitting a curve to.
+SCALE_PHASES = ("parse", "part1", "part2")
+
+
+class ScalePoint:
+    """The best timings of solving one generated input of a certain scale."""
+
+    def __init__(self, scale: int, size: int, timings_ns: dict[str, int]):
+        self.scale = scale
+        self.size = size
+        self.timings_ns = timings_ns
+
+
+def measure_day(year: int, day: int, scales: list[int], seed: int = 0, repeats: int = 1,
+                max_seconds: float = None) -> list[ScalePoint]:
+    """Solve generated inputs of growing scale and keep the fastest time of each phase.
+
+    Once a single run takes longer than max_seconds, larger scales are skipped, since they would only take longer.
+    A part which alone takes longer than that gets killed, and its scale is skipped as well.
+    """
+    module = runner.import_solution(year, day)
+    points = []
+    for scale in sorted(scales):
+        raw = module.Solution().generate_input(scale, seed)
+        size = len(raw.encode("utf-8"))
+        _log.info(f"Day {day} at {scale}x: {size} bytes of input, {repeats} runs")
+        best = {}
+        try:
+            with runner.quiet_output():
+                for _ in range(repeats):
+                    result = module.Solution().solve(raw=raw, time_budget=max_seconds)
+                    for phase in SCALE_PHASES:
+                        if phase in result.timings_ns:
+                            best[phase] = min(best.get(phase, math.inf), result.timings_ns[phase])
+        except supervisor.BudgetExceeded as e:
+            _log.warning(f"{e}, skipping this and any larger scales")
+            break
+        points.append(ScalePoint(scale, size, best))
+        if max_seconds is not None and sum(best.values()) / 1e9 > max_seconds:
+            _log.warning(f"Day {day} took longer than {max_seconds}s at {scale}x, skipping any larger scales")
+            break
+
+    return points
+
+
+def fit_exponent(sizes: list[float], times: list[float]) -> float | None:
+    """Fit time = c * size^k by least squares on a log-log scale and return k, or None if it cannot be fitted."""
+    pairs = [(math.log(s), math.log(t)) for s, t in zip(sizes, times) if s > 0 and t > 0]
+    if len(pairs) < 2:
+        return None
+    mean_x = sum(x for x, _ in pairs) / len(pairs)
+    mean_y = sum(y for _, y in pairs) / len(pairs)
+    var_x = sum((x - mean_x) ** 2 for x, _ in pairs)
+    if var_x == 0:
+        return None
+    return sum((x - mean_x) * (y - mean_y) for x, y in pairs) / var_x
+
+
+def format_report(points: list[ScalePoint]) -> str:
+    """Get a printable table of the timings at each scale, followed by the fitted growth exponent of each phase."""
+    phases = [p for p in SCALE_PHASES if any(p in point.timings_ns for point in points)]
+    rows = [("scale", "bytes", *phases)]
+    for point in points:
+        cells = [f"{point.timings_ns[p] / 1e6:.3f}" if p in point.timings_ns else "-" for p in phases]
+        rows.append((f"{point.scale}x", str(point.size), *cells))
+    exponents = []
+    for phase in phases:
+        measured = [point for point in points if phase in point.timings_ns]
+        k = fit_exponent([point.size for point in measured], [point.timings_ns[phase] for point in measured])
+        exponents.append("?" if k is None else f"n^{k:.2f}")
+    rows.append(("growth", "", *exponents))
+
+    lines = misc.format_table(rows)
+    lines.insert(len(lines) - 1, lines[1])
+    return "\n".join(lines) + "\n(all timings in ms, growth relative to the size of the input)"
@@ -0,0 +1,112 @@
+# A compact store for timestamped snapshots of downloaded data, such as the leaderboard.
+import logging
+import re
+import sqlite3
+import zlib
+from pathlib import Path
+
+from utils import constants, filehandler, misc
+
+# Snapshot files as they were written before this store existed, e.g. "2022_leaderboard_private_view_123-1670000000".
+_LEGACY_FILE = re.compile(r"^(\d+_leaderboard_[\w]+)-(\d+)$")
+_log = logging.getLogger(constants.ROOT_LOGGER + "." + __name__)
+
+
+def url_to_key(url: str) -> str:
+    """Get the key snapshots of the given URL are stored under."""
+    # Drop the domain and file extension, replace slashes.
+    key = re.search(".com/(.*).json", url)[1]
+    return re.sub("/", "_", key)
+
+
+class SnapshotStore:
+    """Keeps compressed snapshots in a small sqlite database, with a direct index to the latest one of each key."""
+
+    def __init__(self, path: Path = None, max_count: int = constants.SNAPSHOT_MAX_COUNT,
+                 max_age: int = constants.SNAPSHOT_MAX_AGE):
+        self.path = path or filehandler.get_cache_dir() / constants.SNAPSHOT_DB_FILENAME
+        self.max_count = max_count
+        self.max_age = max_age
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        is_new = not self.path.exists()
+        self._db = sqlite3.connect(self.path)
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS snapshots (
+                id INTEGER PRIMARY KEY,
+                key TEXT NOT NULL,
+                timestamp INTEGER NOT NULL,
+                data BLOB NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS snapshots_by_key ON snapshots (key, timestamp);
+            CREATE TABLE IF NOT EXISTS latest (
+                key TEXT PRIMARY KEY,
+                snapshot_id INTEGER NOT NULL REFERENCES snapshots (id)
+            );
+        """)
+        if is_new:
+            self._import_legacy_files()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        self._db.close()
+
+    def latest(self, key: str) -> tuple[str, int] | tuple[None, None]:
+        """Get the most recent snapshot for a key and the time it was taken."""
+        row = self._db.execute("""
+            SELECT s.data, s.timestamp FROM latest l JOIN snapshots s ON s.id = l.snapshot_id WHERE l.key = ?
+        """, (key,)).fetchone()
+        if row is None:
+            _log.info(f"Found no snapshot for {key}")
+            return None, None
+        return zlib.decompress(row[0]).decode("utf-8"), row[1]
+
+    def save(self, key: str, data: str, timestamp: int = None):
+        """Store a new snapshot and drop any old ones which fall outside of the retention limits."""
+        timestamp = timestamp if timestamp is not None else misc.unix_now()
+        compressed = zlib.compress(data.encode("utf-8"), 9)
+        with self._db:
+            latest = self._db.execute("""
+                SELECT s.id, s.data, s.timestamp FROM latest l JOIN snapshots s ON s.id = l.snapshot_id
+                WHERE l.key = ?
+            """, (key,)).fetchone()
+            if latest is not None and latest[2] > timestamp:
+                # Older than what is already there, no need to point the index at it.
+                self._db.execute("INSERT INTO snapshots (key, timestamp, data) VALUES (?, ?, ?)",
+                                 (key, timestamp, compressed))
+            elif latest is not None and latest[1] == compressed:
+                # Nothing changed since the last snapshot. Just remember that it is still up to date.
+                self._db.execute("UPDATE snapshots SET timestamp = ? WHERE id = ?", (timestamp, latest[0]))
+            else:
+                cursor = self._db.execute("INSERT INTO snapshots (key, timestamp, data) VALUES (?, ?, ?)",
+                                          (key, timestamp, compressed))
+                self._db.execute("INSERT OR REPLACE INTO latest (key, snapshot_id) VALUES (?, ?)",
+                                 (key, cursor.lastrowid))
+            self._prune(key)
+        _log.info(f"Saved snapshot of {key} ({len(compressed)} bytes compressed)")
+
+    def _prune(self, key: str):
+        """Delete all snapshots beyond the maximum count or age, but never the latest one."""
+        self._db.execute("""
+            DELETE FROM snapshots WHERE key = :key
+            AND id NOT IN (SELECT snapshot_id FROM latest WHERE key = :key)
+            AND (timestamp < :oldest OR id NOT IN (
+                SELECT id FROM snapshots WHERE key = :key ORDER BY timestamp DESC LIMIT :count
+            ))
+        """, {"key": key, "oldest": misc.unix_now() - self.max_age, "count": self.max_count})
+
+    def _import_legacy_files(self):
+        """Move any snapshots which were stored as one plain file each into the database."""
+        cache_dir = self.path.parent
+        legacy = [(path, _LEGACY_FILE.match(path.name)) for path in cache_dir.iterdir() if path.is_file()]
+        legacy = sorted(((path, match) for path, match in legacy if match), key=lambda x: int(x[1][2]))
+        for path, match in legacy:
+            with open(path, "r", encoding="utf-8") as file:
+                self.save(match[1], file.read(), int(match[2]))
+            path.unlink()
+        if legacy:
+            _log.info(f"Imported {len(legacy)} legacy snapshot files into {self.path.name}")
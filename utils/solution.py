@@ -1,24 +1,135 @@
 # A base class for solutions during Advent of Code.
-import copy
+import contextlib
+import hashlib
 import logging
 import os
+import sys
 from abc import ABCMeta, abstractmethod
 from pathlib import Path
+from types import ModuleType
+from typing import Iterator, TYPE_CHECKING
 
 from utils import constants, filehandler
+from utils.lazy import lazy_import
+from utils.timing import SolveResult
+
+if TYPE_CHECKING:
+    # Profiling is rare, so avoid the cost of loading cProfile on every run.
+    from utils.profiling import PhaseProfiler
+    from utils.telemetry import Telemetry
+
+ast = lazy_import("ast")
+copy = lazy_import("copy")
+parsecache = lazy_import("utils.parsecache")
+pickle = lazy_import("pickle")
+supervisor = lazy_import("utils.supervisor")
+telemetry = lazy_import("utils.telemetry")
+
+# The ways in which part 2 can be protected from any changes part 1 makes to the parsed data.
+#   none     - The parts do not mutate their data, so both get the very same object.
+#   reparse  - Part 1 gets the parsed data, then the raw input is parsed again from scratch for part 2.
+#   deepcopy - Part 1 gets a deep copy of the parsed data, part 2 gets the original.
+COPY_STRATEGIES = ("none", "reparse", "deepcopy")
+_IMMUTABLE_TYPES = (bool, int, float, complex, str, bytes, range, type(None))
+# The methods of a solution which turn its input into parsed data.
+PARSE_METHODS = ("parse", "parse_stream", "parse_bytes")
+# The ways in which the puzzle input can be read from disk.
+#   text  - The whole file as one string, passed to parse().
+#   lines - A lazy iterator over the lines of the file, passed to parse_stream().
+#   bytes - A read-only memoryview of the memory-mapped file, passed to parse_bytes().
+INPUT_MODES = ("text", "lines", "bytes")
+# Solutions are built on the helpers in this package, so changes to those may change the answers as well.
+LIBRARY_PACKAGE = "utils.puzzles"
+
+
+def _find_library_modules(module: ModuleType) -> set[str]:
+    """Get the names of all modules of the library package which anything in the given module's namespace comes
+    from."""
+    names = set()
+    for value in vars(module).values():
+        name = value.__name__ if isinstance(value, ModuleType) else getattr(value, "__module__", None)
+        if isinstance(name, str) and name.startswith(LIBRARY_PACKAGE + "."):
+            names.add(name)
+    return names
+
+
+def get_library_hash(module: ModuleType) -> str:
+    """Get a hash of the source code of every module of the library package which the given module depends on, either
+    directly or through other modules of the package."""
+    todo = _find_library_modules(module)
+    sources = {}
+    while todo:
+        name = todo.pop()
+        if name in sources or name not in sys.modules:
+            continue
+        library_module = sys.modules[name]
+        with open(library_module.__file__, "rb") as file:
+            sources[name] = file.read()
+        todo |= _find_library_modules(library_module)
+
+    digest = hashlib.sha256()
+    for name in sorted(sources):
+        digest.update(name.encode("utf-8") + b"\0" + sources[name] + b"\0")
+    return digest.hexdigest()
+
+
+def is_immutable(data) -> bool:
+    """Check whether the given object and everything it contains is immutable."""
+    stack = [data]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, (tuple, frozenset)):
+            stack.extend(item)
+        elif not isinstance(item, _IMMUTABLE_TYPES):
+            return False
+    return True
 
 
 class BaseSolution(metaclass=ABCMeta):
 
+    # One of COPY_STRATEGIES. Solutions whose parts do not mutate their data should declare "none". If not declared,
+    # "none" is picked for immutable data and "reparse" for everything else.
+    copy_strategy: str = None
+    # One of INPUT_MODES. Anything but "text" avoids ever holding the whole input in memory as a string.
+    input_mode: str = "text"
+    # The most time in seconds and resident memory in MiB each part may use. If either is set and budgets are enforced,
+    # the parts run in a separate process which gets killed as soon as it goes over budget.
+    time_budget: float = None
+    memory_budget: int = None
+    # Set for the duration of solve() if any of its phases should be profiled.
+    _profiler: "PhaseProfiler" = None
+    # Set for the duration of solve() to the budgets that apply, as the class attributes may be overridden.
+    _budgets: tuple[float | None, int | None] = (None, None)
+    # Receives the events reported by progress() and trace(), if anything is listening.
+    _telemetry: "Telemetry" = None
+    # The hash of the library modules the solution uses, which only needs to be found once.
+    _library_hash: str = None
+
     def __init__(self):
         self._log = logging.getLogger(constants.ROOT_LOGGER + "." + __name__)
 
     def _get_data(self, test_data: bool = True) -> str:
+        return filehandler.read_input(self._get_input_file(test_data))
+
+    def _get_input_file(self, test_data: bool = True) -> Path:
         year, day = self._get_day()
         if test_data:
-            return filehandler.get_test_input(year, day)
+            return filehandler.get_test_input_file(year, day)
         else:
-            return filehandler.get_puzzle_input(year, day)
+            return filehandler.get_puzzle_input_file(year, day)
+
+    def _choose_copy_strategy(self, data) -> str:
+        """Decide how to keep the parsed data for part 2 safe from part 1."""
+        if self.copy_strategy is not None:
+            if self.copy_strategy not in COPY_STRATEGIES:
+                raise ValueError(f"Unknown copy strategy '{self.copy_strategy}', must be one of {COPY_STRATEGIES}")
+            return self.copy_strategy
+        return "none" if is_immutable(data) else "reparse"
+
+    def _get_source(self) -> bytes:
+        """Get the source code of the module the executing subclass was defined in."""
+        with open(sys.modules[self.__module__].__file__, "rb") as file:
+            return file.read()
 
     def _get_day(self) -> (int, int):
         """Get the correct year and day based on the filepath of the executing subclass."""
@@ -29,10 +140,71 @@ class BaseSolution(metaclass=ABCMeta):
 
         return year, day
 
-    @abstractmethod
     def parse(self, raw: str):
+        """Turn the raw puzzle input into whatever the parts need.
+
+        Solutions which read their input as lines or bytes get this for free, for when the input is already in memory.
+        """
+        if self.input_mode == "lines":
+            return self.parse_stream(iter(raw.splitlines()))
+        if self.input_mode == "bytes":
+            return self.parse_bytes(memoryview(raw.encode("utf-8")))
+        raise NotImplementedError
+
+    def generate_input(self, scale: int, seed: int = 0) -> str:
+        """Generate a random puzzle input which is about 'scale' times as large as a real one.
+
+        Optional, but lets the scale command measure how the solution copes with growing input.
+        """
+        raise NotImplementedError
+
+    def parse_stream(self, lines: Iterator[str]):
+        """Parse the puzzle input one line at a time. Used if the input mode is 'lines'."""
+        raise NotImplementedError
+
+    def parse_bytes(self, buffer: memoryview):
+        """Parse the puzzle input straight from its raw bytes. Used if the input mode is 'bytes'."""
         raise NotImplementedError
 
+    def progress(self, done: int, total: int = None):
+        """Report how far a long-running part has got. Costs next to nothing unless telemetry is enabled."""
+        if self._telemetry is not None:
+            self._telemetry.progress(done, total)
+
+    def trace(self, message: str, *args):
+        """Report what a solution is up to, formatting the message %-style only if it actually gets shown."""
+        if self._telemetry is not None:
+            self._telemetry.trace(message, *args)
+
+    def _add_progress_listener(self, listener):
+        """Pass all progress which gets through on to the listener as well, e.g. to a supervising process."""
+        if self._telemetry is None:
+            self._telemetry = telemetry.Telemetry(interval=supervisor.PROGRESS_INTERVAL)
+        self._telemetry.listeners.append(listener)
+
+    def _call_phase(self, phase: str, func, *args):
+        """Call one of the solution's own functions, profiling it if that phase was selected for profiling, or
+        supervising it if it is a part with a budget."""
+        if self._profiler is not None:
+            return self._profiler.call(phase, func, *args)
+        time_budget, memory_budget = self._budgets
+        if phase not in ("part1", "part2") or (time_budget is None and memory_budget is None):
+            return func(*args)
+        year, day = self._get_day()
+        return supervisor.run_supervised(f"{year} Day {day} {phase}", func, args, time_budget,
+                                         memory_budget * 2**20 if memory_budget is not None else None,
+                                         self._add_progress_listener)
+
+    def _parse_input(self, raw: str | None, path: Path, resources: contextlib.ExitStack, phase: str = "parse"):
+        """Parse the input from memory if it was already read, or straight from the file otherwise."""
+        if raw is not None:
+            return self._call_phase(phase, self.parse, raw)
+        if self.input_mode == "lines":
+            with contextlib.closing(filehandler.iter_lines(path)) as lines:
+                return self._call_phase(phase, self.parse_stream, lines)
+        # The parsed data may well keep referring to the mapped file, so it must stay open until solving is done.
+        return self._call_phase(phase, self.parse_bytes, resources.enter_context(filehandler.map_bytes(path)))
+
     @abstractmethod
     def part1(self, data):
         raise NotImplementedError
@@ -41,15 +213,214 @@ class BaseSolution(metaclass=ABCMeta):
     def part2(self, data):
         raise NotImplementedError
 
-    def solve(self, testing: bool = True):
-        raw = self._get_data(testing)
-        data = self.parse(raw)
-        part1data = copy.deepcopy(data)
+    def _hash_source_without(self, skip) -> str:
+        """Get a hash of the code of the whole module, except for the methods of the solution class whose names the
+        given function rejects. Formatting and comments are ignored."""
+        tree = ast.parse(self._get_source())
+        for node in tree.body:
+            if isinstance(node, ast.ClassDef) and node.name == type(self).__name__:
+                node.body = [n for n in node.body
+                             if not isinstance(n, (ast.FunctionDef, ast.AsyncFunctionDef)) or not skip(n.name)]
+        return hashlib.sha256(ast.dump(tree).encode("utf-8")).hexdigest()
+
+    def _get_library_hash(self) -> str:
+        if self._library_hash is None:
+            self._library_hash = get_library_hash(sys.modules[self.__module__])
+        return self._library_hash
+
+    def _get_part_source_hash(self, part: int) -> str:
+        """Get a hash of all the code which could affect the answer to the given part, i.e. the whole module except
+        for the function solving the other part, along with the library modules it uses."""
+        other = f"part{3 - part}"
+        module_hash = self._hash_source_without(lambda name: name == other)
+        return hashlib.sha256((module_hash + self._get_library_hash()).encode("utf-8")).hexdigest()
+
+    def _find_parse_methods(self) -> set[str]:
+        """Get the names of the parse methods of the solution class and of every method they call through self, no
+        matter how indirectly."""
+        tree = ast.parse(self._get_source())
+        methods = {}
+        for node in tree.body:
+            if isinstance(node, ast.ClassDef) and node.name == type(self).__name__:
+                methods = {n.name: n for n in node.body if isinstance(n, (ast.FunctionDef, ast.AsyncFunctionDef))}
+        todo = [name for name in PARSE_METHODS if name in methods]
+        found = set(todo)
+        while todo:
+            for node in ast.walk(methods[todo.pop()]):
+                if (isinstance(node, ast.Attribute) and isinstance(node.value, ast.Name) and node.value.id == "self"
+                        and node.attr in methods and node.attr not in found):
+                    found.add(node.attr)
+                    todo.append(node.attr)
+        return found
+
+    def _get_parse_source_hash(self) -> str:
+        """Get a hash of all the code which could affect parsing, i.e. the whole module except for methods of the
+        solution class which parsing never calls, along with the library modules it uses."""
+        parse_methods = self._find_parse_methods()
+        module_hash = self._hash_source_without(lambda name: name not in parse_methods)
+        return hashlib.sha256((module_hash + self._get_library_hash()).encode("utf-8")).hexdigest()
+
+    def _load_answers(self, input_hash: str, result: SolveResult):
+        """Fill in any answers which were already computed by the current version of the solution."""
+        for part in (1, 2):
+            entry = filehandler.load_answer(result.year, result.day, part, input_hash,
+                                            self._get_part_source_hash(part))
+            if entry is not None:
+                setattr(result, f"part{part}", entry["answer"])
+                result.cached_parts[part] = entry["elapsed_ns"]
+
+    def _save_answers(self, input_hash: str, result: SolveResult):
+        for part in (1, 2):
+            answer = getattr(result, f"part{part}")
+            # Anything else cannot be stored faithfully, or was probably printed rather than returned.
+            if part in result.cached_parts or not isinstance(answer, (int, float, str)):
+                continue
+            filehandler.save_answer(result.year, result.day, part, input_hash, self._get_part_source_hash(part),
+                                    answer, result.timings_ns[f"part{part}"])
+
+    def _parse_cached(self, raw: str | None, path: Path, input_hash: str, result: SolveResult,
+                      resources: contextlib.ExitStack):
+        """Get the parsed data from the cache if neither the input nor the parsing code changed, or parse it anew."""
+        key = parsecache.make_key(input_hash, self._get_parse_source_hash())
+        with result.phase("parse"):
+            found, data = parsecache.load(key)
+            if not found:
+                data = self._parse_input(raw, path, resources)
+        result.parse_cached = found
+        if found:
+            self._log.debug(f"Loaded parsed data from cache entry {key}")
+        else:
+            # Store the data before either part has the chance to modify it.
+            with result.phase("cache"):
+                parsecache.save(key, data)
+        return data
+
+    def _parse_memoized(self, raw: str, parse_memo: dict, result: SolveResult, phase: str = "parse"):
+        """Get the parsed data from memory if neither the input nor the parsing code changed, or parse it anew."""
+        key = (filehandler.hash_input(raw), self._get_parse_source_hash())
+        with result.phase(phase):
+            found = key in parse_memo
+            data = pickle.loads(parse_memo[key]) if found else self._call_phase(phase, self.parse, raw)
+        if phase == "parse":
+            result.parse_cached = found
+        if not found:
+            # Only ever keep the latest version around.
+            parse_memo.clear()
+            with result.phase("cache"):
+                try:
+                    parse_memo[key] = pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+                except (pickle.PicklingError, TypeError, AttributeError) as e:
+                    self._log.debug(f"Parsed data cannot be kept in memory: {type(e).__name__}: {e}")
+        return data
+
+    def _get_budgets(self, time_budget: float | None, memory_budget: int | None,
+                     enforce_budgets: bool) -> tuple[float | None, int | None]:
+        """Get the budgets for each part, preferring the given ones over those declared by the solution, which only
+        count if they are enforced."""
+        declared = (self.time_budget, self.memory_budget) if enforce_budgets else (None, None)
+        budgets = (time_budget if time_budget is not None else declared[0],
+                   memory_budget if memory_budget is not None else declared[1])
+        if budgets != (None, None) and not supervisor.can_supervise():
+            self._log.warning("Budgets cannot be enforced on this platform, running without them")
+            return None, None
+        return budgets
+
+    def solve(self, testing: bool = True, use_cache: bool = False, profiler: "PhaseProfiler" = None,
+              path: Path = None, raw: str = None, parse_memo: dict = None, time_budget: float = None,
+              memory_budget: int = None, telemetry: "Telemetry" = None, enforce_budgets: bool = False) -> SolveResult:
+        """Solve both parts of the puzzle, print the answers, and return them along with the time of each phase.
+
+        With use_cache, answers are taken from the answer store and parsed data from the parse cache as long as the
+        input and solution are unchanged. A profiler only ever sees the solution's own parsing and parts, never the
+        work done around them. Instead of the day's own input, a different input file or raw input which is already
+        in memory can be solved. Given a parse memo, parsed raw input is kept in it between calls, for as long as the
+        input and the parsing code stay the same. Budgets override the ones the solution declares, which only apply if
+        they are enforced, and a part which exceeds them raises BudgetExceeded. Telemetry receives whatever the
+        solution reports through progress() and trace().
+        """
+        if self.input_mode not in INPUT_MODES:
+            raise ValueError(f"Unknown input mode '{self.input_mode}', must be one of {INPUT_MODES}")
+        year, day = self._get_day()
+        result = SolveResult(year, day, testing)
+        with result.phase("load"):
+            if raw is None:
+                path = path or self._get_input_file(testing)
+                raw = filehandler.read_input(path) if self.input_mode == "text" else None
+        input_hash = None
+        if use_cache:
+            input_hash = filehandler.hash_input(raw) if raw is not None else filehandler.hash_file(path)
+            self._load_answers(input_hash, result)
+
+        self._profiler = profiler
+        self._telemetry = telemetry
+        # Parts which run in another process could not be profiled.
+        if profiler is None:
+            self._budgets = self._get_budgets(time_budget, memory_budget, enforce_budgets)
+        # Solutions which memoise anything have imported the module by now, no need to bother otherwise.
+        memo = sys.modules.get("utils.puzzles.memo")
+        memo_before = memo.snapshot() if memo is not None else None
+        try:
+            with contextlib.ExitStack() as resources:
+                self._solve_parts(raw, path, input_hash, result, resources, parse_memo)
+            memo = sys.modules.get("utils.puzzles.memo")
+            if memo is not None:
+                # Anything memoised in a supervised child process is not seen here.
+                result.memo_stats = memo.stats_since(memo_before or {})
+        finally:
+            self._profiler = None
+            self._telemetry = None
+            self._budgets = (None, None)
+        if use_cache:
+            self._save_answers(input_hash, result)
+        return result
+
+    def _solve_parts(self, raw: str | None, path: Path, input_hash: str | None, result: SolveResult,
+                     resources: contextlib.ExitStack, parse_memo: dict = None):
+        """Parse the input and solve all parts which are not already known."""
+        todo = [part for part in (1, 2) if part not in result.cached_parts]
+        data = part1data = None
+        if parse_memo is not None and raw is None:
+            raise ValueError("Parsed data can only be kept in memory if the raw input is as well")
+        if todo:
+            if parse_memo is not None:
+                data = self._parse_memoized(raw, parse_memo, result)
+            elif input_hash is not None:
+                data = self._parse_cached(raw, path, input_hash, result, resources)
+            else:
+                with result.phase("parse"):
+                    data = self._parse_input(raw, path, resources)
+            # Copying is only ever needed if both parts get to work on the same data. Supervised parts each work on
+            # their own copy in a separate process anyway.
+            shared = len(todo) == 2 and self._budgets == (None, None)
+            result.copy_strategy = self._choose_copy_strategy(data) if shared else "none"
+            self._log.debug(f"Using copy strategy '{result.copy_strategy}'")
+            part1data = data
+            if result.copy_strategy == "deepcopy":
+                with result.phase("copy"):
+                    part1data = copy.deepcopy(data)
 
         self._log.info("---------- PART 1 OUTPUT ----------")
-        print(self.part1(part1data))
+        if 1 in todo:
+            with result.phase("part1"):
+                result.part1 = self._call_phase("part1", self.part1, part1data)
+        else:
+            self._log.info("Using stored answer")
+        print(result.part1)
+        if result.copy_strategy == "reparse":
+            # Let go of the mutated data before parsing again so that only one copy ever exists at a time.
+            del data, part1data
+            if parse_memo is not None:
+                data = self._parse_memoized(raw, parse_memo, result, phase="copy")
+            else:
+                with result.phase("copy"):
+                    data = self._parse_input(raw, path, resources, phase="copy")
         self._log.info("---------- PART 2 OUTPUT ----------")
-        print(self.part2(data))
+        if 2 in todo:
+            with result.phase("part2"):
+                result.part2 = self._call_phase("part2", self.part2, data)
+        else:
+            self._log.info("Using stored answer")
+        print(result.part2)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,146 @@
+# Running parts of a solution in a child process which gets killed if it uses too much time or memory.
+import logging
+import multiprocessing
+import time
+import traceback
+
+from utils import constants
+
+_log = logging.getLogger(constants.ROOT_LOGGER + "." + __name__)
+# How often to check on the child, in seconds.
+POLL_INTERVAL = 0.05
+# Progress events are sent to the supervisor at most this often, in seconds.
+PROGRESS_INTERVAL = 0.1
+
+
+class BudgetExceeded(Exception):
+    """A supervised function ran for too long or used too much memory, and was killed."""
+
+    def __init__(self, name: str, reason: str, elapsed: float, peak_rss: int | None, last_progress: tuple | None):
+        self.name = name
+        self.reason = reason
+        self.elapsed = elapsed
+        self.peak_rss = peak_rss
+        self.last_progress = last_progress
+        details = [f"after {elapsed:.2f}s"]
+        if peak_rss is not None:
+            details.append(f"peak RSS {peak_rss / 2**20:.1f}MiB")
+        if last_progress is not None:
+            done, total, at = last_progress
+            details.append(f"last progress {done}{'' if total is None else f'/{total}'} at {at:.2f}s")
+        else:
+            details.append("no progress reported")
+        super().__init__(f"{name} exceeded its {reason} budget and was killed ({', '.join(details)})")
+
+
+class ProgressSender:
+    """Sends progress events from the child process to the supervisor, but never more often than necessary."""
+
+    def __init__(self, conn, start: float):
+        self.conn = conn
+        self.start = start
+        self.last_sent = 0.0
+
+    def __call__(self, done: int, total: int = None):
+        now = time.perf_counter()
+        if now - self.last_sent >= PROGRESS_INTERVAL:
+            self.last_sent = now
+            self.conn.send(("progress", (done, total, now - self.start)))
+
+
+def can_supervise() -> bool:
+    """Check whether this platform lets the child simply inherit everything it needs, rather than pickling it."""
+    return "fork" in multiprocessing.get_all_start_methods()
+
+
+def get_rss(pid: int) -> int | None:
+    """Get the resident set size of a process in bytes, or None if it cannot be determined."""
+    try:
+        with open(f"/proc/{pid}/status", "r", encoding="ascii") as file:
+            for line in file:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def _child_main(conn, func, args, set_progress):
+    """Entry point of the child process. Reports the result or error of the function back to the supervisor."""
+    set_progress(ProgressSender(conn, time.perf_counter()))
+    try:
+        result = func(*args)
+    except BaseException as e:
+        try:
+            conn.send(("error", e))
+        except Exception:
+            # The exception itself cannot be pickled, so at least pass on what happened.
+            conn.send(("error", RuntimeError("".join(traceback.format_exception(e)))))
+        return
+    try:
+        conn.send(("result", result))
+    except Exception as e:
+        conn.send(("error", TypeError(f"The result of {func.__name__} cannot be sent back: {e}")))
+
+
+def _stop(process):
+    process.terminate()
+    process.join(1)
+    if process.is_alive():
+        process.kill()
+        process.join()
+
+
+def run_supervised(name: str, func, args: tuple, time_budget: float = None, memory_budget: int = None,
+                   set_progress=None):
+    """Call the function in a forked child process and return its result, killing it once it runs for longer than
+    time_budget seconds or its resident memory grows beyond memory_budget bytes.
+
+    set_progress is called in the child with a function which reports progress to the supervisor, so that the last
+    progress can be included in the error if the budget is exceeded.
+    """
+    context = multiprocessing.get_context("fork")
+    receiver, sender = context.Pipe(duplex=False)
+    process = context.Process(target=_child_main, args=(sender, func, args, set_progress or (lambda _: None)),
+                              name=name)
+    start = time.perf_counter()
+    process.start()
+    sender.close()
+    peak_rss = None
+    last_progress = None
+    warned_rss = False
+    try:
+        while True:
+            if receiver.poll(POLL_INTERVAL):
+                try:
+                    kind, payload = receiver.recv()
+                except EOFError:
+                    process.join()
+                    raise RuntimeError(f"{name} died without a result (exit code {process.exitcode})")
+                if kind == "progress":
+                    last_progress = payload
+                    continue
+                process.join()
+                if kind == "error":
+                    raise payload
+                return payload
+
+            elapsed = time.perf_counter() - start
+            if time_budget is not None and elapsed > time_budget:
+                _stop(process)
+                raise BudgetExceeded(name, "time", elapsed, peak_rss, last_progress)
+            if memory_budget is not None:
+                rss = get_rss(process.pid)
+                if rss is None:
+                    if not warned_rss and process.is_alive():
+                        _log.warning(f"Cannot measure the memory usage of {name}, its memory budget is not enforced")
+                        warned_rss = True
+                    continue
+                peak_rss = max(rss, peak_rss or 0)
+                if rss > memory_budget:
+                    _stop(process)
+                    raise BudgetExceeded(name, "memory", elapsed, peak_rss, last_progress)
+    finally:
+        if process.is_alive():
+            _stop(process)
+        receiver.close()
@@ -0,0 +1,81 @@
+# Anything to do with reporting what a solution is up to while it runs goes here.
+import logging
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterator, TextIO
+
+from utils import constants
+
+# How often each kind of event gets through by default, in seconds.
+DEFAULT_INTERVAL = 0.5
+TARGETS = ("none", "log")
+_log = logging.getLogger(constants.ROOT_LOGGER + ".telemetry")
+
+
+class Telemetry:
+    """Passes progress and trace events on to wherever they should go, dropping any which come in too quickly.
+
+    Progress gets through at most once per interval. The same goes for traces, separately for each message, so a
+    trace in a hot loop only ever shows up every now and then. Every line starts with the label, if there is one, so
+    that lines from several solutions in the same place can be told apart.
+    """
+
+    def __init__(self, write: Callable[[str], None] = None, interval: float = DEFAULT_INTERVAL, label: str = None):
+        self.write = write
+        self.interval = interval
+        self._prefix = f"{label} " if label else ""
+        # Called with (done, total) for every single progress event, they have to keep their own pace.
+        self.listeners = []
+        self._start = time.perf_counter()
+        self._last_progress = -interval
+        self._last_trace = {}
+        self._suppressed = {}
+
+    def progress(self, done: int, total: int = None):
+        for listener in self.listeners:
+            listener(done, total)
+        if self.write is None:
+            return
+        now = time.perf_counter() - self._start
+        if now - self._last_progress < self.interval:
+            return
+        self._last_progress = now
+        percent = f" ({done / total:.0%})" if total else ""
+        self.write(f"{self._prefix}[{now:.2f}s] progress {done}{'' if total is None else f'/{total}'}{percent}")
+
+    def trace(self, message: str, *args):
+        """Report a message, formatted %-style with the arguments, but only if it is going to be shown."""
+        if self.write is None:
+            return
+        now = time.perf_counter() - self._start
+        if now - self._last_trace.get(message, -self.interval) < self.interval:
+            self._suppressed[message] = self._suppressed.get(message, 0) + 1
+            return
+        self._last_trace[message] = now
+        suppressed = self._suppressed.pop(message, 0)
+        more = f" (+{suppressed} suppressed)" if suppressed else ""
+        self.write(f"{self._prefix}[{now:.2f}s] {message % args if args else message}{more}")
+
+
+def _write_to(file: TextIO) -> Callable[[str], None]:
+    def write(line: str):
+        file.write(line + "\n")
+        file.flush()
+    return write
+
+
+@contextmanager
+def open_telemetry(target: str | None, interval: float = DEFAULT_INTERVAL,
+                   label: str = None) -> Iterator[Telemetry | None]:
+    """Get telemetry which goes to the target, which is either one of TARGETS or a file to append to, with every line
+    labelled as given.
+
+    Telemetry which goes nowhere is None, so that reporting to it costs nothing at all.
+    """
+    if target is None or target == "none":
+        yield None
+    elif target == "log":
+        yield Telemetry(_log.info, interval, label)
+    else:
+        with open(target, "a", encoding="utf-8") as file:
+            yield Telemetry(_write_to(file), interval, label)
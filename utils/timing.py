@@ -0,0 +1,98 @@
+# Anything to do with measuring how long the different parts of a solution take goes here.
+import time
+from contextlib import contextmanager
+
+from utils import misc
+from utils.lazy import lazy_import
+
+json = lazy_import("json")
+
+# The phases of solving a puzzle, in the order they happen.
+PHASES = ("load", "parse", "cache", "copy", "part1", "part2")
+
+
+class SolveResult:
+    """The answers and per-phase timings of solving a puzzle once."""
+
+    def __init__(self, year: int, day: int, testing: bool):
+        self.year = year
+        self.day = day
+        self.testing = testing
+        self.part1 = None
+        self.part2 = None
+        self.copy_strategy = None
+        self.parse_cached = False
+        # The parts whose answers came from the answer store, and how long they originally took to compute.
+        self.cached_parts = {}
+        self.timings_ns = {}
+        # The statistics of every memo the solution used, by name.
+        self.memo_stats = {}
+
+    def __iter__(self):
+        """Allow unpacking the result into its two answers."""
+        yield self.part1
+        yield self.part2
+
+    def __repr__(self):
+        return f"<SolveResult {self.year}-{self.day}: {self.part1}, {self.part2} in {self.total_ns / 1e6:.3f}ms>"
+
+    @property
+    def answers(self) -> tuple:
+        return self.part1, self.part2
+
+    @property
+    def total_ns(self) -> int:
+        return sum(self.timings_ns.values())
+
+    @contextmanager
+    def phase(self, name: str):
+        """Time everything within this context and record it as the given phase."""
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.timings_ns[name] = self.timings_ns.get(name, 0) + time.perf_counter_ns() - start
+
+    def to_dict(self) -> dict:
+        return {
+            "year": self.year,
+            "day": self.day,
+            "testing": self.testing,
+            "answers": {"part1": self.part1, "part2": self.part2},
+            "copy_strategy": self.copy_strategy,
+            "parse_cached": self.parse_cached,
+            "cached_parts": {f"part{part}": ns for part, ns in self.cached_parts.items()},
+            "timings_ns": dict(self.timings_ns),
+            "memo_stats": {name: stats.to_dict() for name, stats in self.memo_stats.items()},
+            "total_ns": self.total_ns,
+        }
+
+
+def _format_phase(result: SolveResult, phase: str) -> str:
+    if phase in result.timings_ns:
+        return f"{result.timings_ns[phase] / 1e6:.3f}"
+    if phase in ("part1", "part2") and int(phase[-1]) in result.cached_parts:
+        return "cached"
+    return "-"
+
+
+def format_timings(results: list[SolveResult]) -> str:
+    """Get a printable table of the phase timings of several results, in milliseconds."""
+    phases = [p for p in PHASES if p in ("part1", "part2") or any(p in r.timings_ns for r in results)]
+    phases += sorted({p for r in results for p in r.timings_ns if p not in PHASES})
+    rows = [("Day", *phases, "total", "copy via")]
+    for result in results:
+        cells = [_format_phase(result, p) for p in phases]
+        rows.append((f"{result.day:02}", *cells, f"{result.total_ns / 1e6:.3f}", result.copy_strategy or "-"))
+
+    lines = misc.format_table(rows)
+    lines.append("(all timings in ms)")
+    for result in results:
+        for name, stats in result.memo_stats.items():
+            lines.append(f"Day {result.day:02} memo {name}: {stats}")
+    return "\n".join(lines)
+
+
+def to_json(results: list[SolveResult]) -> str:
+    """Serialise several results to JSON. Answers which are not JSON-compatible are stored as strings."""
+    return json.dumps([r.to_dict() for r in results], indent=2, default=str)
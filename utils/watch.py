@@ -0,0 +1,85 @@
+# Keeping one interpreter alive to solve a day again whenever its solution or input changes.
+import importlib
+import logging
+import time
+import traceback
+from pathlib import Path
+
+from utils import constants, filehandler, runner
+
+_log = logging.getLogger(constants.ROOT_LOGGER + "." + __name__)
+
+
+class Watcher:
+    """Watches the solution and input of a day and solves it again on every change, reusing whatever it can."""
+
+    def __init__(self, year: int, day: int, test_input: bool, interval: float = 0.2):
+        self.year = year
+        self.day = day
+        self.test_input = test_input
+        self.interval = interval
+        self.module = None
+        self.solution_file = filehandler.get_solution(year, day)
+        if test_input:
+            self.input_file = filehandler.get_test_input_file(year, day)
+        else:
+            self.input_file = filehandler.get_puzzle_input_file(year, day)
+        self.raw = None
+        # Parsed data survives a reload as long as neither the input nor the code which parses it changes.
+        self.parse_memo = {}
+        self._mtimes = {}
+
+    def _poll(self) -> set[Path]:
+        """Get the watched files which changed since the last poll."""
+        changed = set()
+        for path in (self.solution_file, self.input_file):
+            try:
+                mtime = path.stat().st_mtime_ns
+            except FileNotFoundError:
+                # Editors may briefly remove a file while saving it.
+                continue
+            if self._mtimes.get(path) != mtime:
+                self._mtimes[path] = mtime
+                changed.add(path)
+        return changed
+
+    def _wait_until_settled(self) -> set[Path]:
+        """Wait for a change, and then until the files stop changing, so that a save is only picked up once."""
+        changed = self._poll()
+        while not changed:
+            time.sleep(self.interval)
+            changed = self._poll()
+        while True:
+            time.sleep(self.interval / 4)
+            more = self._poll()
+            if not more:
+                return changed
+            changed |= more
+
+    def solve_once(self, changed: set[Path]):
+        """Bring the module and input up to date with the changed files and solve the puzzle again."""
+        start = time.perf_counter()
+        if self.input_file in changed or self.raw is None:
+            self.raw = filehandler.read_input(self.input_file)
+        if self.module is None:
+            self.module = runner.import_solution(self.year, self.day)
+        elif self.solution_file in changed:
+            self.module = importlib.reload(self.module)
+
+        result = self.module.Solution().solve(self.test_input, raw=self.raw, parse_memo=self.parse_memo)
+        elapsed = time.perf_counter() - start
+        reused = " with parsed data reused" if result.parse_cached else ""
+        _log.info(f"Solved in {elapsed * 1000:.1f}ms{reused}, of which solving took {result.total_ns / 1e6:.1f}ms")
+
+    def run(self):
+        """Solve the puzzle whenever a watched file changes, until interrupted."""
+        _log.info(f"Watching {self.solution_file} and {self.input_file.name}, press Ctrl+C to stop")
+        changed = self._poll()
+        while True:
+            try:
+                self.solve_once(changed)
+            except Exception:
+                # Keep watching, the next save probably fixes it.
+                traceback.print_exc()
+            changed = self._wait_until_settled()
+            _log.info(f"Detected changes in {', '.join(sorted(path.name for path in changed))}")